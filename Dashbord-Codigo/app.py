@@ -1,429 +1,41 @@
 import dash
-from dash import dcc, html, dash_table, callback_context
-from dash.dependencies import Input, Output, ALL
+from dash import html, Patch
+from dash.dependencies import Input, Output, State, ALL, ClientsideFunction
 import dash_bootstrap_components as dbc
-import plotly.express as px
-import plotly.graph_objects as go
 import json
-import pandas as pd
-from plotly.subplots import make_subplots
-
-
-app = dash.Dash(__name__, external_stylesheets=[dbc.themes.BOOTSTRAP, "https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.0.0-beta3/css/all.min.css"], suppress_callback_exceptions=True)
-
-# Cargar archivo CSV
-df = pd.read_csv('Data/datos-graficas.csv') 
-
-
-with open('GeoJSON/map-campeche.geojson') as f:
-    geojson_data = json.load(f)
-
-# Configuración de opciones
-municipios = df['Municipio'].unique()
-years = sorted(df['Año'].unique())
-delitos_options = {bien: df[df['Bien jurídico afectado'] == bien]['Tipo de delito'].unique().tolist() for bien in df['Bien jurídico afectado'].unique()}
-subdelitos_options = {tipo: df[df['Tipo de delito'] == tipo]['Subtipo de delito'].unique().tolist() for tipo in df['Tipo de delito'].unique()}
-modalidades_options = {(bien, tipo, subdelito): df[(df['Bien jurídico afectado'] == bien) & (df['Tipo de delito'] == tipo) & (df['Subtipo de delito'] == subdelito)]['Modalidad'].unique().tolist() for bien in df['Bien jurídico afectado'].unique() for tipo in delitos_options[bien] for subdelito in subdelitos_options[tipo]
-}
-
-custom_style = {
-    'font-family': 'Quattro Slab, serif',
-    'backgroundColor': '#F9F9F9',
-    'padding': '10px'
-}
-
-
-# Layout de la página
-navbar = dbc.Navbar(
-    dbc.Container(
-        [
-            dbc.Row(
-                [
-                    dbc.Col(
-                        html.Img(src='assets/LOGO_FGECAM.png', height="70px"),  
-                        width="auto"
-                    ),
-                    dbc.Col(
-                        dbc.Nav(
-                            [
-                                dbc.NavItem(dbc.NavLink("Inicio", href="/")),
-                                dbc.NavItem(dbc.NavLink("Estadísticas", href="/estadisticas")),
-                            ],
-                            navbar=True,
-                            className="ms-auto"  
-                        ),
-                        width="auto"
-                    ),
-                ],
-                align="center",
-                className="g-0"
-            )
-        ],
-        fluid=True
-    ),
-    color="#10312B",
-    dark=True,
-)
-
-# Define el pie de página
-footer = html.Div(
-    dbc.Row(
-        [
-            dbc.Col(
-                html.Img(src='assets/JAGUAR.png', height="70px"),  
-                width={"size": 2, "offset": 0},  
-                className="text-center"  
-            ),
-            dbc.Col(
-                [
-                    dbc.Nav(
-                        [
-                            dbc.NavItem(dbc.NavLink(html.I(className="fab fa-facebook"), href="https://www.facebook.com/GobiernoDeCampeche/?locale=es_LA", external_link=True)),
-                            dbc.NavItem(dbc.NavLink(html.I(className="fab fa-twitter"), href="https://x.com/ucscampeche?lang=es", external_link=True)),
-                            dbc.NavItem(dbc.NavLink(html.I(className="fab fa-instagram"), href="https://www.instagram.com/gobiernodecampeche/", external_link=True)),
-                            dbc.NavItem(dbc.NavLink(html.I(className="fab fa-tiktok"), href="https://www.tiktok.com/@gobiernodetodos", external_link=True)),
-                        ],
-                        navbar=True,
-                        className="text-start"  
-                    )
-                ],
-                width={"size": 2, "offset": 0}  
-            )
-        ],
-        justify="between",  
-        className="py-2"  
-    ),
-    style={
-        "backgroundColor": "#AB9470",  
-        "color": "white",               
-        "width": "100%",                
-        "position": "relative",          
-        "bottom": "0",                  
-        "padding": "0"                 
-    },
-)
-
-inicio_layout = dbc.Container([
-    dbc.Row([
-        dbc.Col([
-            html.H1("Fiscalía General del Estado de Campeche", style={
-                'color': '#53565A',
-                'font-size': '36px',
-                'font-weight': 'bold',
-                'margin-top': '20px',
-                'text-align': 'center',
-                'font-family': 'Quattro Slab, serif'
-            })
-        ])
-    ]),
-    dbc.Row([
-        dbc.Col([
-            html.H3("Mapa de los Municipios de Campeche", style={'text-align': 'center', 'font-family': 'Quattro Slab, serif'}),
-            dcc.Graph(id="mapa-campeche", figure={}, config={"displayModeBar": False}),
-        ], width=8),
-        dbc.Col([
-            html.H3("Seleccione un año y un tipo de delito para ver las estadísticas", style={'text-align': 'center', 'font-family': 'Quattro Slab, serif'}),
-            dcc.Dropdown(
-                id="year-dropdown",
-                options=[{"label": str(year), "value": year} for year in years],
-                placeholder="Seleccione un año",
-                style={"width": "100%", 'font-family': 'Quattro Slab, serif'}
-            ),
-            dcc.Dropdown(
-                id="delito-dropdown",
-                options=[{'label': delito, 'value': delito} for delito in df['Tipo de delito'].unique()],
-                placeholder="Seleccione un delito",
-                style={"margin-top": "20px", "width": "100%", 'font-family': 'Quattro Slab, serif'}
-            ),
-            dcc.Graph(id="grafica-estadisticas", style={'margin-top': '20px', 'display': 'none'}),
-            html.Button("Otra Selección", id="otra-seleccion-btn", style={
-                'margin-top': '20px',
-                'background-color': '#9F2241',
-                'color': 'white',
-                'border-radius': '15px',
-                'border': 'none',
-                'padding': '10px 15px',
-                'font-family': 'Quattro Slab, serif'
-            }),
-            dcc.Dropdown(
-                id="year-dropdown-otra",
-                options=[{"label": str(year), "value": year} for year in years],
-                placeholder="Seleccione otro año",
-                style={"margin-top": "20px", "display": 'none', "width": "100%", 'font-family': 'Quattro Slab, serif'}
-            ),
-        ], width=4),
-    ]),
-    dbc.Row([
-        dbc.Col(dcc.Graph(id="mapa-campeche-otra", figure={}, style={'margin-top': '20px', 'display': 'none', 'height': '400px', 'font-family': 'Quattro Slab, serif'}), width=8),
-        dbc.Col(dcc.Graph(id="grafica-estadisticas-otra", style={'margin-top': '20px', 'display': 'none', 'height': '400px', 'font-family': 'Quattro Slab, serif'}), width=4),
-    ], style={'height': '450px'})  
-], fluid=True)
-
-estadisticas_layout = dbc.Container([
-    dbc.Row([
-        dbc.Col([dcc.Dropdown(id="bien-juridico-dropdown",
-                               options=[{"label": bien, "value": bien} for bien in delitos_options.keys()],
-                               placeholder="Seleccione Bien Jurídico",
-                               clearable=False,
-                               style={"width": "100%", "margin-bottom": "15px"})], width=4),
-        dbc.Col([dcc.Dropdown(id="municipio-dropdown",
-                               options=[{"label": municipio.capitalize(), "value": municipio} for municipio in municipios],
-                               placeholder="Seleccione Municipio",
-                               clearable=False,
-                               style={"width": "100%", "margin-bottom": "15px"})], width=4),
-        dbc.Col([dcc.Dropdown(id="year-dropdown-estadisticas",
-                               options=[{"label": str(year), "value": year} for year in years],
-                               placeholder="Seleccione Año",
-                               clearable=False,
-                               style={"width": "100%", "margin-bottom": "15px"})], width=4),
-    ], justify="center", style={"padding-top": "20px"}),
-    
-    dbc.Row([
-        dbc.Col([dcc.Dropdown(id="delitos-dropdown",
-                               placeholder="Seleccione Tipo de Delito",
-                               clearable=False,
-                               style={"width": "100%", "margin-bottom": "15px"})], width=6),
-        dbc.Col([dcc.Dropdown(id="subdelitos-dropdown",
-                               placeholder="Seleccione Subtipo de Delito",
-                               clearable=False,
-                               style={"width": "100%", "margin-bottom": "15px"})], width=6),
-    ], justify="center"),
-    
-    dbc.Row([
-        dbc.Col(id="modalidades-container", style={"margin-top": "20px"})  # Contenedor para los botones
-    ]),
-    
-    dbc.Row([
-        dbc.Col([dcc.Graph(id="estadisticas-grafica", style={'margin-top': '20px'})])
-    ]),
-    
-    dbc.Row([
-        dbc.Col([html.Button("Otra Selección", id="otra-seleccion-btn", style={
-            'margin-top': '20px',
-            'background-color': '#9F2241',
-            'color': 'white',
-            'border-radius': '15px',
-            'border': 'none',
-            'padding': '10px 15px',
-            'font-family': 'Quattro Slab, serif'
-        })], width=12)
-    ]),
-    
-    dbc.Row([
-        dbc.Col([dcc.Dropdown(id="estadisticas-year-dropdown-otra",
-                               options=[],
-                               placeholder="Seleccione otro año",
-                               clearable=False,
-                               style={"width": "100%", "margin-top": "15px", "display": "none"})
-        ])
-    ]),
-    
-    dbc.Row([
-        dbc.Col([dcc.Graph(id="estadisticas-grafica-otra", style={'margin-top': '20px', 'display': 'none'})])
-    ])
-], style=custom_style)
-
-# Actualizar la función para crear el mapa de Campeche sincronizado con la gráfica
-@app.callback(
-    [Output("grafica-estadisticas", "figure"),
-     Output("grafica-estadisticas", "style"),
-     Output("mapa-campeche", "figure"),
-     Output("delito-dropdown", "value")],
-    [Input("year-dropdown", "value"),
-     Input("delito-dropdown", "value")]
-)
-def actualizar_grafica_y_mapa(year, delito):
-    fig_mapa_base = px.choropleth(
-        geojson=geojson_data,
-        locations=[feature['properties']['NOM_MUN'] for feature in geojson_data['features']],
-        featureidkey="properties.NOM_MUN",
-        color_discrete_sequence=["lightgray"],
-        title="Mapa de municipios de Campeche"
-    )
-    
-    fig_mapa_base.update_geos(fitbounds="locations", visible=False)
-    fig_mapa_base.update_layout(mapbox_style="carto-positron", mapbox_zoom=7,
-                                mapbox_center={"lat": 19.8301, "lon": -90.5349},
-                                font=dict(family="Quattro Slab, serif"))
-
-    if year and delito:
-        df_filtrado = df[(df['Año'] == year) & (df['Tipo de delito'] == delito)]
-        df_agrupado = df_filtrado.groupby('Municipio')[['Enero', 'Febrero', 'Marzo', 'Abril', 'Mayo', 'Junio', 'Julio', 'Agosto', 'Septiembre', 'Octubre', 'Noviembre', 'Diciembre']].sum()
-        df_agrupado['total_delitos'] = df_agrupado.sum(axis=1)
-        df_agrupado = df_agrupado.reset_index()
-
-        fig_barras = px.bar(
-            df_agrupado,
-            x='total_delitos',
-            y='Municipio',
-            orientation='h',
-            color='total_delitos',
-            color_continuous_scale='RdYlGn_r',
-            labels={'total_delitos': 'Total de Delitos', 'Municipio': 'Municipio'},
-            title=f"Total de delitos por municipio en {year}"
-        )
-        fig_barras.update_layout(font=dict(family="Quattro Slab, serif"))
-
-        fig_mapa = px.choropleth(
-            df_agrupado,
-            geojson=geojson_data,
-            locations="Municipio",
-            featureidkey="properties.NOM_MUN",
-            color="total_delitos",
-            color_continuous_scale="RdYlGn_r",
-            labels={'total_delitos': 'Total de Delitos'},
-            title=f"Mapa de municipios con total de delitos en {year}"
-        )
-
-        fig_mapa.update_geos(fitbounds="locations", visible=False)
-        fig_mapa.update_layout(mapbox_style="carto-positron", mapbox_zoom=7,
-                               mapbox_center={"lat": 19.8301, "lon": -90.5349},
-                               font=dict(family="Quattro Slab, serif"))
-
-        return fig_barras, {'margin-top': '20px', 'display': 'block'}, fig_mapa, delito
-
-    return {}, {'display': 'none'}, fig_mapa_base, None
-
-@app.callback(
-    [Output("year-dropdown-otra", "style"),
-     Output("grafica-estadisticas-otra", "style"),
-     Output("mapa-campeche-otra", "style")],
-    [Input("otra-seleccion-btn", "n_clicks")]
-)
-def mostrar_otra_seleccion(n_clicks):
-    if n_clicks:
-        return {"margin-top": "20px", "display": 'block'}, {"margin-top": "20px", "display": 'block'}, {"margin-top": "20px", "display": 'block'}
-    return {"margin-top": "20px", "display": 'none'}, {"margin-top": "20px", "display": 'none'}, {"margin-top": "20px", "display": 'none'}
-
-@app.callback(
-    [Output("grafica-estadisticas-otra", "figure"),
-     Output("mapa-campeche-otra", "figure")],
-    [Input("year-dropdown-otra", "value"),
-     Input("delito-dropdown", "value")]
-)
-def actualizar_grafica_y_mapa_otra(year, delito):
-    if year and delito:
-        df_filtrado = df[(df['Año'] == year) & (df['Tipo de delito'] == delito)]
-        df_agrupado = df_filtrado.groupby('Municipio')[['Enero', 'Febrero', 'Marzo', 'Abril', 'Mayo', 'Junio', 'Julio', 'Agosto', 'Septiembre', 'Octubre', 'Noviembre', 'Diciembre']].sum()
-        df_agrupado['total_delitos'] = df_agrupado.sum(axis=1)
-        df_agrupado = df_agrupado.reset_index()
-
-        fig_barras = px.bar(
-            df_agrupado,
-            x='total_delitos',
-            y='Municipio',
-            orientation='h',
-            color='total_delitos',
-            color_continuous_scale='RdYlGn_r',
-            labels={'total_delitos': 'Total de Delitos', 'Municipio': 'Municipio'},
-            title=f"Total de delitos por municipio en {year}"
-        )
-        fig_barras.update_layout(font=dict(family="Quattro Slab, serif"))
-
-
-        fig_mapa = px.choropleth(
-            df_agrupado,
-            geojson=geojson_data,
-            locations="Municipio",
-            featureidkey="properties.NOM_MUN",
-            color="total_delitos",
-            color_continuous_scale="RdYlGn_r",
-            labels={'total_delitos': 'Total de Delitos'},
-            title=f"Mapa de municipios con total de delitos en {year}"
-        )
-
-        fig_mapa.update_geos(fitbounds="locations", visible=False)
-        fig_mapa.update_layout(mapbox_style="carto-positron", mapbox_zoom=7,
-                               mapbox_center={"lat": 19.8301, "lon": -90.5349},
-                               font=dict(family="Quattro Slab, serif"))
-
-        return fig_barras, fig_mapa
-
-    return {}, {}
-
-@app.callback(
-    Output("year-dropdown-otra", "options"),
-    [Input("year-dropdown", "value")]
-)
-def actualizar_year_dropdown_otra(year):
-    if year:
-        return [{"label": str(y), "value": y} for y in years if y != year]
-    else:
-        return [{"label": str(y), "value": y} for y in years]
-
-# Actualizar lista de delitos según bien jurídico
-@app.callback(
-    Output("delitos-dropdown", "options"),
-    Output("delitos-dropdown", "value"),
-    Input("bien-juridico-dropdown", "value")
-)
-def update_delitos(bien_juridico):
-    if bien_juridico:
-        tipos_delito = delitos_options[bien_juridico]  
-        return [{"label": tipo, "value": tipo} for tipo in tipos_delito], tipos_delito[0]  
-    return [], None
-
-@app.callback(
-    Output("subdelitos-dropdown", "options"),
-    Output("subdelitos-dropdown", "value"),
-    Input("delitos-dropdown", "value")
-)
-def update_subdelitos(tipo_delito):
-    if tipo_delito:
-        subdelitos = subdelitos_options.get(tipo_delito, [])
-        return [{"label": subdelito, "value": subdelito} for subdelito in subdelitos], subdelitos[0] if subdelitos else None
-    return [], None
-
-@app.callback(
-    Output("modalidades-container", "children"),
-    Input("subdelitos-dropdown", "value"),
-    Input("delitos-dropdown", "value"),
-    Input("bien-juridico-dropdown", "value")
-)
-def update_modalidades(subdelito, tipo_delito, bien_juridico):
-    if subdelito and tipo_delito and bien_juridico:
-        modalidades = df[(df['Bien jurídico afectado'] == bien_juridico) & 
-                           (df['Tipo de delito'] == tipo_delito) & 
-                           (df['Subtipo de delito'] == subdelito)]['Modalidad'].unique()
-        
-        if len(modalidades) > 0:  # Verificar que haya modalidades
-            # Crear botones para cada modalidad
-            return [html.Button(modalidad, id={'type': 'modalidad-button', 'index': modalidad}, 
-                                style={"margin": "5px", 
-                                       "background-color": "#9F2241", 
-                                       "color": "white", 
-                                       "font-family": "Quattro Slab, serif", 
-                                       "border-radius": "15px",
-                                       "padding": "10px 20px"}) for modalidad in modalidades]
-    
-    
-    # Si no hay modalidades, devolver un mensaje
-    return [html.Div("No hay modalidades disponibles.")]
-
-@app.callback(
-    Output("estadisticas-grafica", "figure"),
-    Input("bien-juridico-dropdown", "value"),
-    Input("municipio-dropdown", "value"),
-    Input("year-dropdown-estadisticas", "value"),
-    Input("delitos-dropdown", "value"),
-    Input("subdelitos-dropdown", "value"),
-    Input({"type": "modalidad-button", "index": dash.dependencies.ALL}, "n_clicks")  
-)
-def update_graph(bien_juridico, municipio, year, tipo_delito, subdelito, n_clicks):
-    # Verificar si hay valores seleccionados
-    if not bien_juridico or not municipio or not year or not tipo_delito or not subdelito:
-        return {
-            'data': [],
-            'layout': {
-                'title': "Seleccione todos los filtros",
-                'xaxis': {'title': 'Meses'},
-                'yaxis': {'title': 'Total de Delitos'},
-                'font': {'family': 'Quattro Slab, serif'}, 
-            }
-        }
-
-    # Verificar si hubo clic en alguno de los botones de modalidad
-    modalidad_seleccionada = None
+import os
+import flask
+from config import configuracion
+from tablero import DatosTablero
+from cache import CacheCompartida, CacheFiguras
+from compresion import Compresion
+from calentamiento import Calentamiento
+from ingesta import Ingesta
+from metricas import Metricas, Traza, metricas_cache
+from serializacion import serializador_por_omision, usar_serializador
+from figuras import figura_barras, figura_barras_por_year, figura_mapa, figura_mapas_por_year
+from layout import layout_principal, inicio_layout, estadisticas_layout
+
+
+# Parches para las figuras del Inicio: cuando el navegador ya tiene las figuras completas,
+# al cambiar año o delito sólo se envían los arreglos y el título que cambian
+def parche_barras(municipios_filtrados, totales, year):
+    parche = Patch()
+    parche['data'][0]['x'] = totales
+    parche['data'][0]['y'] = municipios_filtrados
+    parche['data'][0]['marker']['color'] = totales
+    parche['layout']['title']['text'] = f"Total de delitos por municipio en {year}"
+    return parche
+
+def parche_mapa(municipios_filtrados, totales, year):
+    parche = Patch()
+    parche['data'][0]['locations'] = municipios_filtrados
+    parche['data'][0]['z'] = totales
+    parche['layout']['title']['text'] = f"Mapa de municipios con total de delitos en {year}"
+    return parche
+
+# Modalidad del botón que disparó el callback, o None si lo disparó otro filtro
+def modalidad_activada(n_clicks):
     if n_clicks and any(n_clicks):  
         # Obtener el contexto activado
         triggered_context = dash.callback_context.triggered
@@ -431,187 +43,419 @@ def update_graph(bien_juridico, municipio, year, tipo_delito, subdelito, n_click
             triggered_id = triggered_context[0]['prop_id'].split('.')[0]
             # Convertir el ID en un diccionario
             try:
-                modalidad_seleccionada = json.loads(triggered_id)['index']
+                return json.loads(triggered_id)['index']
             except (KeyError, json.JSONDecodeError):
-                modalidad_seleccionada = None
-            
-    # Filtrar los datos según los filtros seleccionados
-    filtered_data = df[(df['Bien jurídico afectado'] == bien_juridico) &
-                         (df['Municipio'] == municipio) &
-                         (df['Año'] == year) &
-                         (df['Tipo de delito'] == tipo_delito) &
-                         (df['Subtipo de delito'] == subdelito)]
-
-    if modalidad_seleccionada:
-        filtered_data = filtered_data[filtered_data['Modalidad'] == modalidad_seleccionada]
-
-    # Verificar si hay datos filtrados
-    if filtered_data.empty:
-        return {
-            'data': [],
+                return None
+    return None
+
+def registrar_callbacks(app, datos, cache_figuras, metricas=None):
+    # Los callbacks se registran en cada app que crea create_app. Cada uno toma la instantánea
+    # de los datos una vez al empezar (datos.instantanea(), que los carga la primera vez) y lee
+    # todo de ella, así una recarga a la mitad de la llamada no le mezcla datos
+    callback = metricas.callback(app) if metricas is not None else app.callback
+
+    # Figuras completas del Inicio para un año y un delito; se guardan serializadas en la caché
+    @cache_figuras.memoizar('inicio')
+    def figuras_inicio(instantanea, year, delito):
+        municipios_filtrados, totales = instantanea.cubo.totales_por_municipio(year=year, tipo=delito)
+        fig_barras = figura_barras(municipios_filtrados, totales, f"Total de delitos por municipio en {year}")
+        fig_mapa = figura_mapa(instantanea.geojson_data, municipios_filtrados, totales, f"Mapa de municipios con total de delitos en {year}")
+        return fig_barras, fig_mapa
+
+    # Actualizar la función para crear el mapa de Campeche sincronizado con la gráfica
+    @callback(
+        [Output("grafica-estadisticas", "figure"),
+         Output("grafica-estadisticas", "style"),
+         Output("mapa-campeche", "figure"),
+         Output("delito-dropdown", "value"),
+         Output("inicio-figuras", "data")],
+        [Input("year-dropdown", "value"),
+         Input("delito-dropdown", "value")],
+        [State("inicio-figuras", "data")]
+    )
+    def actualizar_grafica_y_mapa(year, delito, figuras):
+        instantanea = datos.instantanea()
+        if year and delito:
+            if figuras == 'datos':
+                municipios_filtrados, totales = instantanea.cubo.totales_por_municipio(year=year, tipo=delito)
+                return (parche_barras(municipios_filtrados, totales, year), {'margin-top': '20px', 'display': 'block'},
+                        parche_mapa(municipios_filtrados, totales, year), delito, 'datos')
+            fig_barras, fig_mapa = figuras_inicio(instantanea, year, delito)
+            return fig_barras, {'margin-top': '20px', 'display': 'block'}, fig_mapa, delito, 'datos'
+
+        return {}, {'display': 'none'}, instantanea.mapa_base, None, 'base'
+
+    # Mostrar los controles de "Otra Selección" (se ejecuta en el navegador, assets/clientside.js)
+    app.clientside_callback(
+        ClientsideFunction(namespace="dashboard", function_name="mostrar_otra_seleccion"),
+        [Output("year-dropdown-otra", "style"),
+         Output("grafica-estadisticas-otra", "style"),
+         Output("mapa-campeche-otra", "style")],
+        [Input("otra-seleccion-btn", "n_clicks")]
+    )
+
+    # Totales por municipio de cada año comparado que tiene filas: los años, y por año
+    # los municipios presentes y sus totales
+    def comparacion_inicio(instantanea, years_otros, delito):
+        years_encontrados, totales, presente = instantanea.cubo.comparar(years_otros, 'Municipio', tipo=delito)
+        years_con_datos, municipios_por_year, totales_por_year = [], [], []
+        for i, year in enumerate(years_encontrados):
+            if presente[i].any():
+                years_con_datos.append(int(year))
+                municipios_por_year.append(instantanea.cubo.municipios[presente[i]])
+                totales_por_year.append(totales[i][presente[i]])
+        return years_con_datos, municipios_por_year, totales_por_year
+
+    @cache_figuras.memoizar('inicio-otra')
+    def figuras_inicio_otra(instantanea, years_otros, delito):
+        years_con_datos, municipios_por_year, totales_por_year = comparacion_inicio(instantanea, years_otros, delito)
+        texto_years = ", ".join(str(y) for y in years_con_datos)
+        fig_barras = figura_barras_por_year(years_con_datos, municipios_por_year, totales_por_year,
+                                            f"Total de delitos por municipio en {texto_years}")
+        fig_mapa = figura_mapas_por_year(instantanea.geojson_data_otra, years_con_datos, municipios_por_year, totales_por_year,
+                                         f"Mapa de municipios con total de delitos en {texto_years}")
+        return fig_barras, fig_mapa
+
+    @callback(
+        [Output("grafica-estadisticas-otra", "figure"),
+         Output("mapa-campeche-otra", "figure"),
+         Output("inicio-figuras-otra", "data")],
+        [Input("year-dropdown-otra", "value"),
+         Input("delito-dropdown", "value")],
+        [State("inicio-figuras-otra", "data")]
+    )
+    def actualizar_grafica_y_mapa_otra(years_otros, delito, figuras):
+        # Comparación con uno o varios años: todos se agregan en una sola consulta al cubo
+        # y se dibujan como barras agrupadas por año y un mapa pequeño por año
+        if years_otros and not isinstance(years_otros, list):
+            years_otros = [years_otros]
+        if years_otros and delito:
+            instantanea = datos.instantanea()
+            years_con_datos, municipios_por_year, totales_por_year = comparacion_inicio(instantanea, years_otros, delito)
+
+            if figuras == years_con_datos:
+                # Mismos años que la figura en el navegador: sólo cambian los valores de cada traza
+                parche_barras_otra = Patch()
+                parche_mapa_otra = Patch()
+                for i, (municipios_filtrados, totales) in enumerate(zip(municipios_por_year, totales_por_year)):
+                    parche_barras_otra['data'][i]['x'] = totales
+                    parche_barras_otra['data'][i]['y'] = municipios_filtrados
+                    parche_mapa_otra['data'][i]['locations'] = municipios_filtrados
+                    parche_mapa_otra['data'][i]['z'] = totales
+                return parche_barras_otra, parche_mapa_otra, years_con_datos
+
+            fig_barras, fig_mapa = figuras_inicio_otra(instantanea, years_otros, delito)
+            return fig_barras, fig_mapa, years_con_datos
+
+        return {}, {}, None
+
+    # Años disponibles para la comparación, sin el año ya seleccionado (en el navegador)
+    app.clientside_callback(
+        ClientsideFunction(namespace="dashboard", function_name="actualizar_year_dropdown_otra"),
+        Output("year-dropdown-otra", "options"),
+        [Input("year-dropdown", "value")],
+        [State("years-store", "data")]
+    )
+
+    # Actualizar lista de delitos según bien jurídico
+    @callback(
+        Output("delitos-dropdown", "options"),
+        Output("delitos-dropdown", "value"),
+        Input("bien-juridico-dropdown", "value")
+    )
+    def update_delitos(bien_juridico):
+        if bien_juridico:
+            tipos_delito = datos.instantanea().taxonomia.delitos(bien_juridico)  
+            return [{"label": tipo, "value": tipo} for tipo in tipos_delito], tipos_delito[0]  
+        return [], None
+
+    @callback(
+        Output("subdelitos-dropdown", "options"),
+        Output("subdelitos-dropdown", "value"),
+        Input("delitos-dropdown", "value")
+    )
+    def update_subdelitos(tipo_delito):
+        if tipo_delito:
+            subdelitos = datos.instantanea().taxonomia.subdelitos(tipo_delito)
+            return [{"label": subdelito, "value": subdelito} for subdelito in subdelitos], subdelitos[0] if subdelitos else None
+        return [], None
+
+    @callback(
+        Output("modalidades-container", "children"),
+        Input("subdelitos-dropdown", "value"),
+        Input("delitos-dropdown", "value"),
+        Input("bien-juridico-dropdown", "value")
+    )
+    def update_modalidades(subdelito, tipo_delito, bien_juridico):
+        if subdelito and tipo_delito and bien_juridico:
+            modalidades = datos.instantanea().taxonomia.modalidades(bien_juridico, tipo_delito, subdelito)
+
+            if len(modalidades) > 0:  # Verificar que haya modalidades
+                # Crear botones para cada modalidad
+                return [html.Button(modalidad, id={'type': 'modalidad-button', 'index': modalidad}, 
+                                    style={"margin": "5px", 
+                                           "background-color": "#9F2241", 
+                                           "color": "white", 
+                                           "font-family": "Quattro Slab, serif", 
+                                           "border-radius": "15px",
+                                           "padding": "10px 20px"}) for modalidad in modalidades]
+
+
+        # Si no hay modalidades, devolver un mensaje
+        return [html.Div("No hay modalidades disponibles.")]
+
+    # Gráfica mensual de Estadísticas para unos filtros; se guarda serializada en la caché
+    @cache_figuras.memoizar('estadisticas')
+    def figura_estadisticas(instantanea, bien_juridico, municipio, year, tipo_delito, subdelito, modalidad_seleccionada):
+        # Sumar los delitos por mes de los filtros seleccionados
+        cubo = instantanea.cubo
+        monthly_totals = cubo.totales_mensuales(bien=bien_juridico, municipio=municipio, year=year,
+                                                tipo=tipo_delito, subtipo=subdelito, modalidad=modalidad_seleccionada)
+
+        # Verificar si hay datos filtrados
+        if monthly_totals is None:
+            return {
+                'data': [],
+                'layout': {
+                    'title': "No hay datos para mostrar",
+                    'xaxis': {'title': 'Meses'},
+                    'yaxis': {'title': 'Total de Delitos'},
+                    'font': {'family': 'Quattro Slab, serif'}, 
+                }
+            }
+
+        # Crear la figura
+        figure = {
+            'data': [{
+                'x': cubo.meses,
+                'y': monthly_totals,
+                'type': 'bar',  
+                'name': modalidad_seleccionada if modalidad_seleccionada else tipo_delito,  
+                'text': monthly_totals,  
+                'textposition': 'auto',
+                'marker': {
+                'color': monthly_totals,  
+                'colorscale': [
+                    [0, '#888B8D'],  
+                    [0.33, '#235B4E'],  
+                    [0.66, '#BCA986'],  
+                    [1, '#9F2241']  
+                ],
+            } 
+            }],
             'layout': {
-                'title': "No hay datos para mostrar",
+                'title': f"Total de Delitos en {municipio} en {year}: {tipo_delito} - {subdelito} - {modalidad_seleccionada}" if modalidad_seleccionada else f"Total de Delitos por Mes: {tipo_delito} - {subdelito}",
                 'xaxis': {'title': 'Meses'},
                 'yaxis': {'title': 'Total de Delitos'},
                 'font': {'family': 'Quattro Slab, serif'}, 
             }
         }
 
-    # Sumar los delitos por mes
-    monthly_totals = filtered_data.iloc[:, 6:].sum().reset_index()
-    monthly_totals.columns = ['mes', 'total delitos']
-
-    # Crear la figura
-    figure = {
-        'data': [{
-            'x': monthly_totals['mes'],
-            'y': monthly_totals['total delitos'],
-            'type': 'bar',  
-            'name': modalidad_seleccionada if modalidad_seleccionada else tipo_delito,  
-            'text': monthly_totals['total delitos'],  
-            'textposition': 'auto',
-            'marker': {
-            'color': monthly_totals['total delitos'],  
-            'colorscale': [
-                [0, '#888B8D'],  
-                [0.33, '#235B4E'],  
-                [0.66, '#BCA986'],  
-                [1, '#9F2241']  
-            ],
-        } 
-        }],
-        'layout': {
-            'title': f"Total de Delitos en {municipio} en {year}: {tipo_delito} - {subdelito} - {modalidad_seleccionada}" if modalidad_seleccionada else f"Total de Delitos por Mes: {tipo_delito} - {subdelito}",
-            'xaxis': {'title': 'Meses'},
-            'yaxis': {'title': 'Total de Delitos'},
-            'font': {'family': 'Quattro Slab, serif'}, 
-        }
-    }
-
-    return figure
-
-@app.callback(
-    Output("estadisticas-year-dropdown-otra", "options"),
-    Output("estadisticas-year-dropdown-otra", "style"),
-    Input("otra-seleccion-btn", "n_clicks"),
-    Input("year-dropdown-estadisticas", "value")
-)
-def update_year_dropdown_otra(n_clicks, year):
-    if n_clicks:
-        return [{"label": str(y), "value": y} for y in years if y != year], {"width": "100%", "margin-top": "15px", "display": "block"}
-    return [], {"width": "100%", "margin-top": "15px", "display": "none"}
-
-@app.callback(
-    Output("estadisticas-grafica-otra", "figure"),
-    Output("estadisticas-grafica-otra", "style"),
-    Input("bien-juridico-dropdown", "value"),
-    Input("municipio-dropdown", "value"),
-    Input("estadisticas-year-dropdown-otra", "value"),
-    Input("delitos-dropdown", "value"),
-    Input("subdelitos-dropdown", "value"),
-    Input({"type": "modalidad-button", "index": dash.dependencies.ALL}, "n_clicks")  
-)
-def update_graph_otra(bien_juridico, municipio, year, tipo_delito, subdelito, n_clicks):
-    if not year:
-        return {}, {"margin-top": "20px", "display": "none"}
-
-    # Verificar si hay valores seleccionados
-    if not bien_juridico or not municipio or not year or not tipo_delito or not subdelito:
-        return {
-            'data': [],
-            'layout': {
-                'title': "Seleccione todos los filtros",
-                'xaxis': {'title': 'Meses'},
-                'yaxis': {'title': 'Total de Delitos'},
-                'font': {'family': 'Quattro Slab, serif'}, 
+        return figure
+
+    @callback(
+        Output("estadisticas-grafica", "figure"),
+        Input("bien-juridico-dropdown", "value"),
+        Input("municipio-dropdown", "value"),
+        Input("year-dropdown-estadisticas", "value"),
+        Input("delitos-dropdown", "value"),
+        Input("subdelitos-dropdown", "value"),
+        Input({"type": "modalidad-button", "index": dash.dependencies.ALL}, "n_clicks")  
+    )
+    def update_graph(bien_juridico, municipio, year, tipo_delito, subdelito, n_clicks):
+        # Verificar si hay valores seleccionados
+        if not bien_juridico or not municipio or not year or not tipo_delito or not subdelito:
+            return {
+                'data': [],
+                'layout': {
+                    'title': "Seleccione todos los filtros",
+                    'xaxis': {'title': 'Meses'},
+                    'yaxis': {'title': 'Total de Delitos'},
+                    'font': {'family': 'Quattro Slab, serif'}, 
+                }
             }
-        }, {"margin-top": "20px", "display": "block"}
 
-    # Verificar si hubo clic en alguno de los botones de modalidad
-    modalidad_seleccionada = None
-    if n_clicks and any(n_clicks):  
-        triggered_context = dash.callback_context.triggered
-        if triggered_context and len(triggered_context) > 0:
-            triggered_id = triggered_context[0]['prop_id'].split('.')[0]
-            # Convertir el ID en un diccionario
-            try:
-                modalidad_seleccionada = json.loads(triggered_id)['index']
-            except (KeyError, json.JSONDecodeError):
-                modalidad_seleccionada = None  
-                
-    # Filtrar los datos según los filtros seleccionados
-    filtered_data = df[(df['Bien jurídico afectado'] == bien_juridico) &
-                         (df['Municipio'] == municipio) &
-                         (df['Año'] == year) &
-                         (df['Tipo de delito'] == tipo_delito) &
-                         (df['Subtipo de delito'] == subdelito)]
-
-    if modalidad_seleccionada:
-        filtered_data = filtered_data[filtered_data['Modalidad'] == modalidad_seleccionada]
-
-    # Verificar si hay datos filtrados
-    if filtered_data.empty:
-        return {
-            'data': [],
+        # Verificar si hubo clic en alguno de los botones de modalidad
+        modalidad_seleccionada = modalidad_activada(n_clicks)
+
+        # Sumar los delitos por mes de los filtros seleccionados y crear la figura
+        return figura_estadisticas(datos.instantanea(), bien_juridico, municipio, year, tipo_delito, subdelito, modalidad_seleccionada)
+
+    # Mostrar y llenar la lista de otro año en Estadísticas (en el navegador)
+    app.clientside_callback(
+        ClientsideFunction(namespace="dashboard", function_name="update_year_dropdown_otra"),
+        Output("estadisticas-year-dropdown-otra", "options"),
+        Output("estadisticas-year-dropdown-otra", "style"),
+        Input("otra-seleccion-btn", "n_clicks"),
+        Input("year-dropdown-estadisticas", "value"),
+        State("years-store", "data")
+    )
+
+    @callback(
+        Output("estadisticas-grafica-otra", "figure"),
+        Output("estadisticas-grafica-otra", "style"),
+        Input("bien-juridico-dropdown", "value"),
+        Input("municipio-dropdown", "value"),
+        Input("estadisticas-year-dropdown-otra", "value"),
+        Input("delitos-dropdown", "value"),
+        Input("subdelitos-dropdown", "value"),
+        Input({"type": "modalidad-button", "index": dash.dependencies.ALL}, "n_clicks")  
+    )
+    def update_graph_otra(bien_juridico, municipio, years_otros, tipo_delito, subdelito, n_clicks):
+        if not years_otros:
+            return {}, {"margin-top": "20px", "display": "none"}
+        if not isinstance(years_otros, list):
+            years_otros = [years_otros]
+
+        # Verificar si hay valores seleccionados
+        if not bien_juridico or not municipio or not tipo_delito or not subdelito:
+            return {
+                'data': [],
+                'layout': {
+                    'title': "Seleccione todos los filtros",
+                    'xaxis': {'title': 'Meses'},
+                    'yaxis': {'title': 'Total de Delitos'},
+                    'font': {'family': 'Quattro Slab, serif'}, 
+                }
+            }, {"margin-top": "20px", "display": "block"}
+
+        # Verificar si hubo clic en alguno de los botones de modalidad
+        modalidad_seleccionada = modalidad_activada(n_clicks)
+
+        # Totales por mes de todos los años seleccionados en una sola consulta al cubo
+        cubo = datos.instantanea().cubo
+        years_encontrados, monthly_totals, presente = cubo.comparar(
+            years_otros, 'Mes', bien=bien_juridico, municipio=municipio,
+            tipo=tipo_delito, subtipo=subdelito, modalidad=modalidad_seleccionada)
+
+        # Verificar si hay datos filtrados
+        if not presente.any():
+            return {
+                'data': [],
+                'layout': {
+                    'title': "No hay datos para mostrar",
+                    'xaxis': {'title': 'Meses'},
+                    'yaxis': {'title': 'Total de Delitos'},
+                    'font': {'family': 'Quattro Slab, serif'}, 
+                }
+            }, {"margin-top": "20px", "display": "block"}
+
+        texto_years = ", ".join(str(y) for i, y in enumerate(years_encontrados) if presente[i])
+
+        # Crear la figura: una serie de barras por año
+        figure = {
+            'data': [{
+                'x': cubo.meses,
+                'y': monthly_totals[i],
+                'type': 'bar',  
+                'name': str(year),  
+                'text': monthly_totals[i],  
+                'textposition': 'auto',
+            } for i, year in enumerate(years_encontrados) if presente[i]],
             'layout': {
-                'title': "No hay datos para mostrar",
+                'title': f"Total de Delitos en {municipio} en {texto_years}: {tipo_delito} - {subdelito} - {modalidad_seleccionada}" if modalidad_seleccionada else f"Total de Delitos por Mes en {texto_years}: {tipo_delito} - {subdelito}",
                 'xaxis': {'title': 'Meses'},
                 'yaxis': {'title': 'Total de Delitos'},
                 'font': {'family': 'Quattro Slab, serif'}, 
+                'barmode': 'group',
+                'colorway': ['#9F2241', '#235B4E', '#BCA986', '#888B8D', '#10312B', '#AB9470', '#53565A'],
             }
-        }, {"margin-top": "20px", "display": "block"}
-
-    # Sumar los delitos por mes
-    monthly_totals = filtered_data.iloc[:, 6:].sum().reset_index()
-    monthly_totals.columns = ['mes', 'total delitos']
-
-    # Crear la figura
-    figure = {
-        'data': [{
-            'x': monthly_totals['mes'],
-            'y': monthly_totals['total delitos'],
-            'type': 'bar',  
-            'name': modalidad_seleccionada if modalidad_seleccionada else tipo_delito,  
-            'text': monthly_totals['total delitos'],  
-            'textposition': 'auto',
-            'marker': {
-            'color': monthly_totals['total delitos'],  
-            'colorscale': [
-                [0, '#888B8D'],  
-                [0.33, '#235B4E'],  
-                [0.66, '#BCA986'],  
-                [1, '#9F2241']  
-            ],
-        } 
-        }],
-        'layout': {
-            'title': f"Total de Delitos en {municipio} en {year}: {tipo_delito} - {subdelito} - {modalidad_seleccionada}" if modalidad_seleccionada else f"Total de Delitos por Mes: {tipo_delito} - {subdelito}",
-            'xaxis': {'title': 'Meses'},
-            'yaxis': {'title': 'Total de Delitos'},
-            'font': {'family': 'Quattro Slab, serif'}, 
         }
-    }
-
-    return figure, {"margin-top": "20px", "display": "block"}
-
-# Navegación de páginas
-@app.callback(
-    Output("page-content", "children"),
-    Input("url", "pathname")
-)
-def display_page(pathname):
-    if pathname == "/estadisticas":
-        return estadisticas_layout
-    else:
-        return inicio_layout
-
-# Layout principal de la aplicación
-app.layout = html.Div([
-    dcc.Location(id="url"),
-    navbar,
-    html.Div(id="page-content"),
-    footer 
-])
+
+        return figure, {"margin-top": "20px", "display": "block"}
+
+    # Navegación de páginas
+    @callback(
+        Output("page-content", "children"),
+        Input("url", "pathname")
+    )
+    def display_page(pathname):
+        if pathname == "/estadisticas":
+            return estadisticas_layout(datos.instantanea())
+        else:
+            return inicio_layout(datos.instantanea())
+
+def create_app(config=None):
+    # Crea la app con la configuración por omisión (config.py) más los valores de `config`.
+    # No lee datos: se cargan en la primera petición, o aquí mismo con config['precargar']
+    config = configuracion(config)
+    usar_serializador(config['serializador'] or serializador_por_omision())
+    app = dash.Dash(__name__, external_stylesheets=[dbc.themes.BOOTSTRAP, "https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.0.0-beta3/css/all.min.css"], suppress_callback_exceptions=True)
+    datos = DatosTablero(config)
+    # Caché LRU de las figuras, con la versión de los datos en la clave, y opcionalmente un
+    # segundo nivel en disco que comparten los workers
+    compartida = None
+    if config['cache_compartida']:
+        compartida = CacheCompartida(config['cache_compartida'], max_bytes=config['cache_compartida_bytes'],
+                                     ttl=config['cache_compartida_ttl'])
+    cache_figuras = CacheFiguras(max_entradas=config['cache_entradas'], max_bytes=config['cache_bytes'], compartida=compartida)
+    app.datos = datos
+    app.cache_figuras = cache_figuras
+
+    @app.server.route('/geo/<nombre>')
+    def servir_geometria(nombre):
+        contenido = datos.geometrias.get(f'/geo/{nombre}')
+        if contenido is None:
+            flask.abort(404)
+        respuesta = flask.Response(contenido, mimetype='application/geo+json')
+        respuesta.headers['Cache-Control'] = 'public, max-age=31536000, immutable'
+        return respuesta
+
+    # El layout es una función para que los años y las listas se lean de los datos
+    # en la primera petición y no al crear la app (y de la instantánea vigente en cada una)
+    app.layout = lambda: layout_principal(datos.instantanea())
+
+    # La medición de los callbacks se instala sólo si se usa (métricas, Server-Timing o traza):
+    # apagada, los callbacks no se envuelven
+    metricas = None
+    if config['metricas'] or config['server_timing'] or config['traza']:
+        traza = Traza(config['traza'], config['traza_minimo_ms']) if config['traza'] else None
+        metricas = Metricas(server_timing=config['server_timing'], traza=traza)
+    registrar_callbacks(app, datos, cache_figuras, metricas)
+    if metricas is not None:
+        metricas.instrumentar(app)
+        if config['metricas']:
+            metricas.agregar_fuente(metricas_cache(cache_figuras))
+            metricas.registrar_ruta(app)
+    app.metricas = metricas
+
+    compresion = None
+    if config['compresion']:
+        compresion = Compresion(config['compresion_minimo_bytes'])
+        compresion.instalar(app)
+    app.compresion = compresion
+
+    ingesta = None
+    if config['ingesta']:
+        ingesta = Ingesta(datos, config['ingesta'], config['ingesta_intervalo'])
+        app.server.before_request(ingesta.iniciar)
+    app.ingesta = ingesta
+
+    # Calentamiento de la caché de figuras después de cada recarga o novedad y, con
+    # precargar, al crear la app
+    calentamiento = None
+    if config['calentamiento']:
+        calentamiento = Calentamiento(cache_figuras, config['calentamiento_procesos'], config['calentamiento_maximo'])
+    app.calentamiento = calentamiento
+
+    if config['precargar']:
+        datos.cargar()
+        # Las novedades que ya están en el directorio se integran aquí, en el maestro de gunicorn
+        if ingesta is not None:
+            ingesta.revisar()
+        if compresion is not None:
+            compresion.precomprimir(datos.geometrias)
+        if calentamiento is not None:
+            calentamiento.calentar(datos.instantanea())
+        # Con gunicorn esto corre en el maestro: los workers no deben heredar la conexión a SQLite
+        if compartida is not None:
+            compartida.cerrar()
+    # Se suscribe después de la carga inicial: las novedades que ya estaban se integran sin
+    # calentar en el hilo y la caché se calienta una sola vez arriba, con el pool de procesos
+    if calentamiento is not None:
+        datos.al_publicar(calentamiento.al_publicar)
+    return app
 
 if __name__ == "__main__":
-    app.run_server(debug=True)
\ No newline at end of file
+    # Servidor de desarrollo; en producción se usa gunicorn con wsgi.py
+    create_app().run(debug=os.environ.get("DASHBOARD_DEBUG", "1") == "1")
\ No newline at end of file
@@ -0,0 +1,26 @@
+// Callbacks que sólo cambian estilos o filtran la lista fija de años: se ejecutan
+// en el navegador y no hacen una petición al servidor.
+window.dash_clientside = Object.assign({}, window.dash_clientside, {
+    dashboard: {
+        mostrar_otra_seleccion: function(n_clicks) {
+            var style = {"margin-top": "20px", "display": n_clicks ? "block" : "none"};
+            return [style, style, style];
+        },
+
+        actualizar_year_dropdown_otra: function(year, years) {
+            return years
+                .filter(function(y) { return y !== year; })
+                .map(function(y) { return {"label": String(y), "value": y}; });
+        },
+
+        update_year_dropdown_otra: function(n_clicks, year, years) {
+            if (n_clicks) {
+                var options = years
+                    .filter(function(y) { return y !== year; })
+                    .map(function(y) { return {"label": String(y), "value": y}; });
+                return [options, {"width": "100%", "margin-top": "15px", "display": "block"}];
+            }
+            return [[], {"width": "100%", "margin-top": "15px", "display": "none"}];
+        }
+    }
+});
@@ -0,0 +1,118 @@
+import argparse
+import multiprocessing
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+
+# Se ejecuta como python bench/cache_compartida.py desde Dashbord-Codigo
+DIRECTORIO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, DIRECTORIO)
+
+from cache import CacheCompartida
+
+
+# Comprueba la caché compartida de figuras (cache.CacheCompartida) sobre un archivo temporal:
+# que las entradas venzan con el ttl, que se desalojen las usadas hace más tiempo, que el
+# total no pase de max_bytes y que varios procesos escribiendo a la vez no pierdan ni mezclen
+# entradas. Termina con error si alguna comprobación falla:
+#   python bench/cache_compartida.py [--procesos 4] [--operaciones 400]
+TAMANO = 10_000
+
+fallas = []
+
+
+def verificar(condicion, mensaje):
+    print(f"  {'ok' if condicion else 'FALLA'}  {mensaje}")
+    if not condicion:
+        fallas.append(mensaje)
+
+
+def total_real(ruta):
+    # (bytes, entradas) contados directamente en la tabla, para compararlos con la tabla total
+    with sqlite3.connect(ruta) as conexion:
+        return conexion.execute('SELECT COALESCE(SUM(bytes), 0), COUNT(*) FROM figuras').fetchone()
+
+
+def comprobar_ttl(ruta):
+    print("Vencimiento")
+    cache = CacheCompartida(ruta, ttl=1)
+    cache.guardar(('a', (1,), 'v1'), 'x' * 1000)
+    verificar(cache.obtener(('a', (1,), 'v1')) == 'x' * 1000, "una entrada recién guardada se lee")
+    verificar(cache.obtener(('a', (1,), 'v2')) is None, "otra versión de los datos no coincide")
+    time.sleep(1.1)
+    verificar(cache.obtener(('a', (1,), 'v1')) is None, "pasado el ttl la entrada ya no se lee")
+    verificar(cache.estadisticas()['entradas'] == 0, "la entrada vencida se borra al leerla")
+    cache.cerrar()
+
+
+def comprobar_lru(ruta):
+    print("Desalojo y límite de bytes")
+    cache = CacheCompartida(ruta, max_bytes=20 * TAMANO)
+    cache.USO_MINIMO = 0
+    for i in range(25):
+        cache.guardar(('g', i), 'y' * TAMANO)
+        # La primera se usa después de cada escritura, así que nunca es la usada hace más tiempo
+        cache.obtener(('g', 0))
+    estadisticas = cache.estadisticas()
+    verificar(cache.obtener(('g', 0)) is not None, "la entrada más usada sobrevive")
+    verificar(cache.obtener(('g', 1)) is None, "la usada hace más tiempo se desaloja")
+    verificar(cache.obtener(('g', 24)) is not None, "la última guardada está")
+    verificar(estadisticas['bytes'] <= cache.max_bytes, f"el total ({estadisticas['bytes']} bytes) no pasa de max_bytes")
+    verificar(total_real(ruta) == (estadisticas['bytes'], estadisticas['entradas']), "el total coincide con la suma de las entradas")
+    cache.guardar(('grande',), 'z' * (cache.max_bytes + 1))
+    verificar(cache.obtener(('grande',)) is None, "una entrada más grande que max_bytes no se guarda")
+    cache.cerrar()
+
+
+# Heredada por los procesos de comprobar_concurrencia
+_cache = None
+
+
+def _trabajador(semilla, operaciones, claves):
+    generador = random.Random(semilla)
+    aciertos = incorrectas = 0
+    for _ in range(operaciones):
+        numero = generador.randrange(claves)
+        texto = _cache.obtener(('f', (numero,), 'v'))
+        if texto is None:
+            _cache.guardar(('f', (numero,), 'v'), str(numero % 10) * TAMANO)
+        elif texto == str(numero % 10) * TAMANO:
+            aciertos += 1
+        else:
+            incorrectas += 1
+    return aciertos, incorrectas, _cache.errores
+
+
+def comprobar_concurrencia(ruta, procesos, operaciones):
+    global _cache
+    print(f"{procesos} procesos escribiendo a la vez")
+    _cache = CacheCompartida(ruta, max_bytes=40 * TAMANO)
+    _cache.cerrar()
+    with multiprocessing.get_context('fork').Pool(procesos) as pool:
+        resultados = pool.starmap(_trabajador, [(semilla, operaciones, 60) for semilla in range(procesos)])
+    estadisticas = _cache.estadisticas()
+    verificar(sum(aciertos for aciertos, _, _ in resultados) > 0, "hay aciertos entre procesos")
+    verificar(all(incorrectas == 0 for _, incorrectas, _ in resultados), "ninguna lectura devuelve otro texto")
+    verificar(all(errores == 0 for _, _, errores in resultados), "ningún error de SQLite")
+    verificar(estadisticas['bytes'] <= _cache.max_bytes, f"el total ({estadisticas['bytes']} bytes) no pasa de max_bytes")
+    verificar(total_real(ruta) == (estadisticas['bytes'], estadisticas['entradas']), "el total coincide con la suma de las entradas")
+    _cache.cerrar()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Comprueba el vencimiento, el desalojo y la concurrencia de la caché compartida")
+    parser.add_argument('--procesos', type=int, default=4)
+    parser.add_argument('--operaciones', type=int, default=400, help="Lecturas o escrituras por proceso")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directorio:
+        comprobar_ttl(os.path.join(directorio, 'ttl.sqlite'))
+        comprobar_lru(os.path.join(directorio, 'lru.sqlite'))
+        comprobar_concurrencia(os.path.join(directorio, 'concurrencia.sqlite'), args.procesos, args.operaciones)
+
+    if fallas:
+        sys.exit(f"{len(fallas)} comprobaciones fallaron")
+    print("Todas las comprobaciones pasaron")
@@ -0,0 +1,217 @@
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+# Se ejecuta como python bench/callbacks.py desde Dashbord-Codigo: las rutas de los datos son relativas a él
+DIRECTORIO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, DIRECTORIO)
+os.chdir(DIRECTORIO)
+
+from dash._callback_context import context_value
+from dash._utils import AttributeDict, to_json
+
+from app import create_app
+from datos import CSV, MESES, leer_csv
+from geometria import NIVELES, leer_nivel
+from paquete import escribir_paquete
+
+
+# Latencia de los callbacks de servidor con datos del tamaño de datos-graficas.csv multiplicado
+# por cada escala. Los callbacks se llaman directamente (sin HTTP) sobre una app creada con
+# create_app a partir de un paquete temporal, y el resultado se guarda en JSON:
+#   python bench/callbacks.py [--escalas 1 10 100 1000] [--repeticiones 50]
+ESCALAS = (1, 10, 100, 1000)
+SALIDA = 'bench/resultados/callbacks.json'
+
+
+def escalar(df, factor, semilla=0):
+    # Repite las filas `factor` veces como municipios nuevos ("Campeche 2", "Campeche 3", ...).
+    # Las copias tienen conteos Poisson alrededor de los originales, así que conservan la
+    # taxonomía, los años y la proporción de ceros; el cubo crece en el eje de municipios.
+    if factor == 1:
+        return df
+    rng = np.random.default_rng(semilla)
+    filas = len(df)
+    origen = np.tile(np.arange(filas), factor)
+    copia = np.repeat(np.arange(factor), filas)
+
+    columnas = {}
+    for columna in df.columns:
+        if columna == 'Municipio':
+            municipios = df['Municipio'].cat
+            categorias = [municipio if k == 0 else f"{municipio} {k + 1}"
+                          for municipio in municipios.categories for k in range(factor)]
+            codigos = municipios.codes.to_numpy().astype(np.int32)[origen] * factor + copia
+            columnas[columna] = pd.Categorical.from_codes(codigos, categorias)
+        elif columna in MESES:
+            valores = df[columna].to_numpy()[origen]
+            nuevas = copia > 0
+            valores = valores.astype(np.int64)
+            valores[nuevas] = rng.poisson(valores[nuevas])
+            columnas[columna] = valores
+        else:
+            columnas[columna] = df[columna].take(origen).to_numpy()
+    return pd.DataFrame(columnas)
+
+
+def percentil(tiempos, q):
+    return float(np.percentile(tiempos, q)) * 1000
+
+
+def con_disparador(prop_id):
+    # modalidad_activada lee callback_context.triggered; fuera de una petición hay que fijarlo
+    context_value.set(AttributeDict(triggered_inputs=[{'prop_id': prop_id, 'value': 1}]))
+
+
+def escenarios(app, repeticiones, semilla=0):
+    # {nombre: (función, [argumentos por repetición], preparar)}; preparar se llama antes de cada
+    # repetición (vaciar o llenar la caché, fijar el botón que disparó el callback)
+    funciones = {registro['callback'].__wrapped__.__name__: registro['callback'].__wrapped__
+                 for registro in app.callback_map.values() if 'callback' in registro}
+    datos = app.datos
+    rng = np.random.default_rng(semilla)
+    years = [int(y) for y in datos.years]
+    tipos = datos.taxonomia.tipos()
+    municipios = list(datos.municipios)
+    ramas = [(bien, tipo, subtipo, modalidades)
+             for bien, por_tipo in datos.taxonomia.arbol.items()
+             for tipo, por_subtipo in por_tipo.items()
+             for subtipo, modalidades in por_subtipo.items()]
+
+    def elegir(lista):
+        return lista[rng.integers(len(lista))]
+
+    def varios_years():
+        return sorted(int(y) for y in rng.choice(years, size=min(3, len(years)), replace=False))
+
+    inicio = [(elegir(years), elegir(tipos)) for _ in range(repeticiones)]
+    otra = [(varios_years(), elegir(tipos)) for _ in range(repeticiones)]
+    rama = [ramas[rng.integers(len(ramas))] for _ in range(repeticiones)]
+    filtro = [(bien, elegir(municipios), elegir(years), tipo, subtipo, modalidades) for bien, tipo, subtipo, modalidades in rama]
+
+    vaciar = app.cache_figuras.limpiar
+    ninguno = lambda i: None
+    modalidad = lambda i: con_disparador(json.dumps({'index': filtro[i][5][0], 'type': 'modalidad-button'}) + '.n_clicks')
+    return {
+        'actualizar_grafica_y_mapa': (funciones['actualizar_grafica_y_mapa'], [(y, d, None) for y, d in inicio], lambda i: vaciar()),
+        'actualizar_grafica_y_mapa [caché]': (funciones['actualizar_grafica_y_mapa'], [(y, d, None) for y, d in inicio],
+                                              lambda i: funciones['actualizar_grafica_y_mapa'](*inicio[i], None)),
+        'actualizar_grafica_y_mapa [parche]': (funciones['actualizar_grafica_y_mapa'], [(y, d, 'datos') for y, d in inicio], ninguno),
+        'actualizar_grafica_y_mapa_otra': (funciones['actualizar_grafica_y_mapa_otra'], [(ys, d, None) for ys, d in otra], lambda i: vaciar()),
+        'update_delitos': (funciones['update_delitos'], [(bien,) for bien, _, _, _ in rama], ninguno),
+        'update_subdelitos': (funciones['update_subdelitos'], [(tipo,) for _, tipo, _, _ in rama], ninguno),
+        'update_modalidades': (funciones['update_modalidades'], [(subtipo, tipo, bien) for bien, tipo, subtipo, _ in rama], ninguno),
+        'update_graph': (funciones['update_graph'], [f[:5] + ([],) for f in filtro], ninguno),
+        'update_graph [modalidad]': (funciones['update_graph'], [f[:5] + ([1],) for f in filtro], modalidad),
+        'update_graph_otra': (funciones['update_graph_otra'], [(f[0], f[1], varios_years(), f[3], f[4], []) for f in filtro], ninguno),
+        'display_page': (funciones['display_page'], [('/estadisticas' if i % 2 else '/',) for i in range(repeticiones)], ninguno),
+    }
+
+
+def medir(funcion, argumentos, preparar, repeticiones_memoria=5):
+    # Primero los tiempos sin tracemalloc (que hace más lenta cada asignación) y después
+    # el pico de memoria con unas cuantas repeticiones
+    tiempos = []
+    tamanos = []
+    for i, args in enumerate(argumentos):
+        preparar(i)
+        inicio = time.perf_counter()
+        resultado = funcion(*args)
+        tiempos.append(time.perf_counter() - inicio)
+        tamanos.append(len(to_json(resultado)))
+
+    pico = 0
+    tracemalloc.start()
+    for i, args in enumerate(argumentos[:repeticiones_memoria]):
+        preparar(i)
+        tracemalloc.reset_peak()
+        funcion(*args)
+        pico = max(pico, tracemalloc.get_traced_memory()[1])
+    tracemalloc.stop()
+    context_value.set({})
+
+    return {
+        'repeticiones': len(tiempos),
+        'p50_ms': percentil(tiempos, 50),
+        'p95_ms': percentil(tiempos, 95),
+        'max_ms': max(tiempos) * 1000,
+        'pico_memoria_bytes': pico,
+        'bytes_respuesta_p50': int(np.median(tamanos)),
+        'bytes_respuesta_max': max(tamanos),
+    }
+
+
+def medir_escala(base, factor, repeticiones, directorio):
+    df = escalar(base, factor)
+    ruta = os.path.join(directorio, f'escala-{factor}.paquete')
+    escribir_paquete(df, {nivel: leer_nivel(nivel) for nivel in NIVELES}, ruta)
+    filas = len(df)
+    del df
+
+    tracemalloc.start()
+    inicio = time.perf_counter()
+    app = create_app({'paquete': ruta, 'csv': os.path.join(directorio, 'sin-csv.csv'), 'precargar': True})
+    carga = time.perf_counter() - inicio
+    pico_carga = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    resultado = {
+        'escala': factor,
+        'filas': filas,
+        'municipios': len(app.datos.cubo.municipios),
+        'carga_s': carga,
+        'pico_memoria_carga_bytes': pico_carga,
+        'cubo_bytes': int(app.datos.cubo.valores.nbytes + app.datos.cubo.presente.nbytes),
+        'callbacks': {},
+    }
+    for nombre, (funcion, argumentos, preparar) in escenarios(app, repeticiones).items():
+        resultado['callbacks'][nombre] = medir(funcion, argumentos, preparar)
+    os.remove(ruta)
+    return resultado
+
+
+def imprimir(resultado):
+    print(f"\nEscala {resultado['escala']}x: {resultado['filas']} filas, {resultado['municipios']} municipios, "
+          f"carga {resultado['carga_s']:.2f} s, cubo {resultado['cubo_bytes'] / 1e6:.1f} MB")
+    print(f"  {'callback':38} {'p50 ms':>9} {'p95 ms':>9} {'pico KB':>9} {'bytes':>9}")
+    for nombre, medida in resultado['callbacks'].items():
+        print(f"  {nombre:38} {medida['p50_ms']:9.2f} {medida['p95_ms']:9.2f} "
+              f"{medida['pico_memoria_bytes'] / 1024:9.0f} {medida['bytes_respuesta_p50']:9d}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Mide la latencia, memoria y tamaño de respuesta de los callbacks a varias escalas de datos")
+    parser.add_argument('--csv', default=CSV)
+    parser.add_argument('--escalas', type=int, nargs='+', default=list(ESCALAS))
+    parser.add_argument('--repeticiones', type=int, default=50)
+    parser.add_argument('--salida', default=SALIDA)
+    args = parser.parse_args()
+
+    base = leer_csv(args.csv)
+    resultados = {
+        'fecha': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'plataforma': platform.platform(),
+        'csv': args.csv,
+        'repeticiones': args.repeticiones,
+        'escalas': [],
+    }
+    with tempfile.TemporaryDirectory() as directorio:
+        for factor in args.escalas:
+            resultado = medir_escala(base, factor, args.repeticiones, directorio)
+            imprimir(resultado)
+            resultados['escalas'].append(resultado)
+
+    os.makedirs(os.path.dirname(args.salida) or '.', exist_ok=True)
+    with open(args.salida, 'w', encoding='utf-8') as f:
+        json.dump(resultados, f, ensure_ascii=False, indent=2)
+    print(f"\nResultados en {args.salida}")
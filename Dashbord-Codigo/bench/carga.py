@@ -0,0 +1,308 @@
+import argparse
+import gzip
+import http.client
+import json
+import os
+import random
+import sys
+import threading
+import time
+import urllib.parse
+from collections import defaultdict
+from datetime import datetime
+
+import numpy as np
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+# Prueba de carga por HTTP contra la app ya levantada (python app.py o gunicorn). Cada hilo
+# repite sesiones como las de un usuario: carga la página, elige año y delito, usa "Otra
+# Selección", pasa a Estadísticas y recorre bien jurídico, delito, subtipo y modalidades.
+# Las peticiones a /_dash-update-component se arman con /_dash-dependencies, igual que el
+# navegador, y los valores se eligen de lo que devuelve la propia app.
+#   python bench/carga.py --url http://127.0.0.1:8050 --concurrencia 8 --duracion 30
+# El cliente usa hilos de Python: con muchos hilos puede ser él el cuello de botella,
+# conviene correrlo en otra máquina o repartirlo en varios procesos.
+
+
+class Registro:
+    # Latencias y errores por paso de la sesión, compartido por todos los hilos
+    def __init__(self):
+        self._candado = threading.Lock()
+        self.latencias = defaultdict(list)
+        self.errores = defaultdict(int)
+        self.bytes = defaultdict(int)
+        self.sesiones = 0
+
+    def anotar(self, paso, segundos, estado, tamano):
+        with self._candado:
+            self.latencias[paso].append(segundos)
+            self.bytes[paso] += tamano
+            if not 200 <= estado < 300:
+                self.errores[paso] += 1
+
+    def resumen(self, duracion):
+        pasos = {}
+        for paso, tiempos in sorted(self.latencias.items()):
+            pasos[paso] = {
+                'peticiones': len(tiempos),
+                'errores': self.errores[paso],
+                'p50_ms': float(np.percentile(tiempos, 50)) * 1000,
+                'p95_ms': float(np.percentile(tiempos, 95)) * 1000,
+                'p99_ms': float(np.percentile(tiempos, 99)) * 1000,
+                'bytes_promedio': self.bytes[paso] // len(tiempos),
+            }
+        todas = [t for tiempos in self.latencias.values() for t in tiempos]
+        errores = sum(self.errores.values())
+        return {
+            'duracion_s': duracion,
+            'sesiones': self.sesiones,
+            'peticiones': len(todas),
+            'peticiones_por_s': len(todas) / duracion if duracion else 0,
+            'tasa_error': errores / len(todas) if todas else 0,
+            'p50_ms': float(np.percentile(todas, 50)) * 1000 if todas else 0,
+            'p95_ms': float(np.percentile(todas, 95)) * 1000 if todas else 0,
+            'p99_ms': float(np.percentile(todas, 99)) * 1000 if todas else 0,
+            'pasos': pasos,
+        }
+
+
+class Cliente:
+    # Una conexión keep-alive por hilo que, como un navegador, acepta respuestas comprimidas;
+    # se anotan los bytes transferidos y se devuelve el contenido ya descomprimido
+    def __init__(self, url, registro, timeout=60):
+        partes = urllib.parse.urlsplit(url)
+        self._host = partes.hostname
+        self._puerto = partes.port or 80
+        self._timeout = timeout
+        self._conexion = None
+        self.registro = registro
+
+    def pedir(self, paso, metodo, ruta, cuerpo=None):
+        encabezados = {'Accept-Encoding': 'gzip, br' if brotli is not None else 'gzip'}
+        if cuerpo is not None:
+            cuerpo = json.dumps(cuerpo).encode('utf-8')
+            encabezados['Content-Type'] = 'application/json'
+        inicio = time.perf_counter()
+        try:
+            if self._conexion is None:
+                self._conexion = http.client.HTTPConnection(self._host, self._puerto, timeout=self._timeout)
+            self._conexion.request(metodo, ruta, body=cuerpo, headers=encabezados)
+            respuesta = self._conexion.getresponse()
+            contenido = respuesta.read()
+            estado = respuesta.status
+            codificacion = respuesta.getheader('Content-Encoding')
+        except (OSError, http.client.HTTPException):
+            self._conexion = None
+            contenido, estado, codificacion = b'', 599, None
+        self.registro.anotar(paso, time.perf_counter() - inicio, estado, len(contenido))
+        if codificacion == 'gzip':
+            contenido = gzip.decompress(contenido)
+        elif codificacion == 'br':
+            contenido = brotli.decompress(contenido)
+        return estado, contenido
+
+
+class Callbacks:
+    # Arma el cuerpo de /_dash-update-component para cada callback a partir de /_dash-dependencies
+    def __init__(self, dependencias):
+        self._dependencias = [d for d in dependencias if not d.get('clientside_function')]
+
+    def buscar(self, salida):
+        for dependencia in self._dependencias:
+            if salida in dependencia['output'].strip('.').split('...'):
+                return dependencia
+        raise KeyError(f"No hay callback con la salida {salida}")
+
+    @staticmethod
+    def _salidas(dependencia):
+        salidas = [{'id': s.rsplit('.', 1)[0], 'property': s.rsplit('.', 1)[1]}
+                   for s in dependencia['output'].strip('.').split('...')]
+        return salidas if dependencia['output'].startswith('..') else salidas[0]
+
+    def cuerpo(self, salida, entradas, estados=(), disparador=None):
+        # entradas: un valor por Input; para un Input con ALL, una lista de (id, valor)
+        dependencia = self.buscar(salida)
+        valores = []
+        for entrada, valor in zip(dependencia['inputs'], entradas):
+            if isinstance(entrada['id'], dict) or entrada['id'].startswith('{'):
+                valores.append([{'id': id_, 'property': entrada['property'], 'value': v} for id_, v in valor])
+            else:
+                valores.append({'id': entrada['id'], 'property': entrada['property'], 'value': valor})
+        primero = dependencia['inputs'][0]
+        return {
+            'output': dependencia['output'],
+            'outputs': self._salidas(dependencia),
+            'inputs': valores,
+            'state': [{'id': estado['id'], 'property': estado['property'], 'value': valor}
+                      for estado, valor in zip(dependencia['state'], estados)],
+            'changedPropIds': [disparador or f"{primero['id']}.{primero['property']}"],
+        }
+
+
+def buscar_componente(arbol, id_):
+    # Props del componente con ese id dentro de un layout serializado
+    if isinstance(arbol, dict):
+        props = arbol.get('props', {})
+        if props.get('id') == id_:
+            return props
+        return buscar_componente(props.get('children'), id_)
+    if isinstance(arbol, list):
+        for hijo in arbol:
+            encontrado = buscar_componente(hijo, id_)
+            if encontrado is not None:
+                return encontrado
+    return None
+
+
+class Sesion:
+    def __init__(self, cliente, callbacks, rng, pausa=0.0):
+        self.cliente = cliente
+        self.callbacks = callbacks
+        self.rng = rng
+        self.pausa = pausa
+        self.geometrias = set()
+
+    def llamar(self, paso, salida, entradas, estados=(), disparador=None):
+        if self.pausa:
+            time.sleep(self.rng.uniform(0, 2 * self.pausa))
+        estado, contenido = self.cliente.pedir(
+            paso, 'POST', '/_dash-update-component', self.callbacks.cuerpo(salida, entradas, estados, disparador))
+        if estado != 200:
+            # Sin respuesta que leer (204 PreventUpdate o error)
+            return {}
+        return json.loads(contenido).get('response', {})
+
+    def pedir_geometria(self, figura):
+        # El navegador descarga cada URL de geometría una sola vez y después usa su caché
+        for traza in (figura or {}).get('data', []):
+            url = traza.get('geojson')
+            if isinstance(url, str) and url not in self.geometrias:
+                self.geometrias.add(url)
+                self.cliente.pedir('GET /geo', 'GET', url)
+
+    def ejecutar(self):
+        rng = self.rng
+        self.cliente.pedir('GET /', 'GET', '/')
+        estado, layout = self.cliente.pedir('GET /_dash-layout', 'GET', '/_dash-layout')
+        self.cliente.pedir('GET /_dash-dependencies', 'GET', '/_dash-dependencies')
+        if estado != 200:
+            return
+        years = (buscar_componente(json.loads(layout), 'years-store') or {}).get('data') or [2015]
+
+        # Inicio: mapa base, luego año y delito, y algunos cambios que ya van como parches
+        pagina = self.llamar('page-content /', 'page-content.children', ['/'])
+        delitos = buscar_componente(pagina.get('page-content', {}).get('children'), 'delito-dropdown') or {}
+        delitos = [opcion['value'] for opcion in delitos.get('options', [])] or ['Robo']
+        respuesta = self.llamar('inicio (base)', 'mapa-campeche.figure', [None, None], [None])
+        self.pedir_geometria(respuesta.get('mapa-campeche', {}).get('figure'))
+        figuras = respuesta.get('inicio-figuras', {}).get('data')
+        year, delito = rng.choice(years), rng.choice(delitos)
+        for i in range(1 + rng.randrange(4)):
+            respuesta = self.llamar('inicio' if figuras != 'datos' else 'inicio (parche)',
+                                    'mapa-campeche.figure', [year, delito], [figuras])
+            self.pedir_geometria(respuesta.get('mapa-campeche', {}).get('figure'))
+            figuras = respuesta.get('inicio-figuras', {}).get('data', figuras)
+            if rng.random() < 0.5:
+                year = rng.choice(years)
+            else:
+                delito = rng.choice(delitos)
+
+        # Otra Selección: uno a tres años más, y luego otro delito con los mismos años
+        candidatos = [y for y in years if y != year] or years
+        otros = sorted(rng.sample(candidatos, min(len(candidatos), 1 + rng.randrange(3))))
+        figuras_otra = None
+        for delito_otra in (delito, rng.choice(delitos)):
+            respuesta = self.llamar('inicio otra' if figuras_otra != otros else 'inicio otra (parche)',
+                                    'mapa-campeche-otra.figure', [otros, delito_otra], [figuras_otra])
+            self.pedir_geometria(respuesta.get('mapa-campeche-otra', {}).get('figure'))
+            figuras_otra = respuesta.get('inicio-figuras-otra', {}).get('data', figuras_otra)
+
+        # Estadísticas: listas en cascada, gráfica mensual, clic en una modalidad y comparación
+        pagina = self.llamar('page-content /estadisticas', 'page-content.children', ['/estadisticas'])
+        arbol = pagina.get('page-content', {}).get('children')
+        bienes = [o['value'] for o in (buscar_componente(arbol, 'bien-juridico-dropdown') or {}).get('options', [])]
+        municipios = [o['value'] for o in (buscar_componente(arbol, 'municipio-dropdown') or {}).get('options', [])]
+        if not bienes or not municipios:
+            return
+        bien, municipio, year = rng.choice(bienes), rng.choice(municipios), rng.choice(years)
+        respuesta = self.llamar('update_delitos', 'delitos-dropdown.options', [bien])
+        tipo = respuesta.get('delitos-dropdown', {}).get('value')
+        respuesta = self.llamar('update_subdelitos', 'subdelitos-dropdown.options', [tipo])
+        subtipo = respuesta.get('subdelitos-dropdown', {}).get('value')
+        respuesta = self.llamar('update_modalidades', 'modalidades-container.children', [subtipo, tipo, bien])
+        botones = respuesta.get('modalidades-container', {}).get('children') or []
+        ids = [b['props']['id'] for b in botones if isinstance(b, dict) and isinstance(b.get('props', {}).get('id'), dict)]
+
+        filtros = [bien, municipio, year, tipo, subtipo]
+        self.llamar('update_graph', 'estadisticas-grafica.figure', filtros + [[(id_, None) for id_ in ids]])
+        if ids:
+            elegido = rng.randrange(len(ids))
+            clics = [(id_, 1 if i == elegido else None) for i, id_ in enumerate(ids)]
+            disparador = json.dumps(ids[elegido], sort_keys=True, separators=(',', ':')) + '.n_clicks'
+            self.llamar('update_graph (modalidad)', 'estadisticas-grafica.figure', filtros + [clics], disparador=disparador)
+        candidatos = [y for y in years if y != year] or years
+        otros = sorted(rng.sample(candidatos, min(len(candidatos), 2)))
+        self.llamar('update_graph_otra', 'estadisticas-grafica-otra.figure',
+                    [bien, municipio, otros, tipo, subtipo, [(id_, None) for id_ in ids]])
+
+
+def trabajador(url, callbacks, registro, fin, sesiones, semilla, pausa):
+    cliente = Cliente(url, registro)
+    rng = random.Random(semilla)
+    while time.perf_counter() < fin:
+        with registro._candado:
+            if sesiones is not None and registro.sesiones >= sesiones:
+                return
+            registro.sesiones += 1
+        Sesion(cliente, callbacks, rng, pausa).ejecutar()
+
+
+def imprimir(resumen):
+    print(f"{'paso':32} {'peticiones':>10} {'errores':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'bytes':>9}")
+    for paso, medida in resumen['pasos'].items():
+        print(f"{paso:32} {medida['peticiones']:10d} {medida['errores']:8d} {medida['p50_ms']:9.1f} "
+              f"{medida['p95_ms']:9.1f} {medida['p99_ms']:9.1f} {medida['bytes_promedio']:9d}")
+    print(f"\n{resumen['sesiones']} sesiones, {resumen['peticiones']} peticiones en {resumen['duracion_s']:.1f} s: "
+          f"{resumen['peticiones_por_s']:.1f} peticiones/s, p95 {resumen['p95_ms']:.1f} ms, "
+          f"p99 {resumen['p99_ms']:.1f} ms, errores {resumen['tasa_error']:.2%}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Prueba de carga por HTTP con sesiones de usuario contra la app levantada")
+    parser.add_argument('--url', default='http://127.0.0.1:8050')
+    parser.add_argument('--concurrencia', type=int, default=8, help="sesiones simultáneas (hilos)")
+    parser.add_argument('--duracion', type=float, default=30, help="segundos de prueba")
+    parser.add_argument('--sesiones', type=int, help="detenerse después de este número de sesiones")
+    parser.add_argument('--pausa', type=float, default=0.0, help="pausa promedio entre acciones de un usuario, en segundos")
+    parser.add_argument('--semilla', type=int, default=0)
+    parser.add_argument('--salida', help="archivo JSON con el resumen")
+    args = parser.parse_args()
+
+    registro = Registro()
+    estado, dependencias = Cliente(args.url, Registro()).pedir('dependencias', 'GET', '/_dash-dependencies')
+    if estado != 200:
+        sys.exit(f"No se pudo leer {args.url}/_dash-dependencies (estado {estado})")
+    callbacks = Callbacks(json.loads(dependencias))
+
+    inicio = time.perf_counter()
+    hilos = [threading.Thread(target=trabajador, daemon=True,
+                              args=(args.url, callbacks, registro, inicio + args.duracion, args.sesiones, args.semilla + i, args.pausa))
+             for i in range(args.concurrencia)]
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+
+    resumen = registro.resumen(time.perf_counter() - inicio)
+    resumen.update({'fecha': datetime.now().isoformat(timespec='seconds'), 'url': args.url,
+                    'concurrencia': args.concurrencia, 'pausa_s': args.pausa})
+    imprimir(resumen)
+    if args.salida:
+        os.makedirs(os.path.dirname(args.salida) or '.', exist_ok=True)
+        with open(args.salida, 'w', encoding='utf-8') as f:
+            json.dump(resumen, f, ensure_ascii=False, indent=2)
@@ -0,0 +1,54 @@
+import argparse
+import os
+import re
+import subprocess
+import sys
+
+
+# Mide cuánto cuesta importar la app con python -X importtime, en un proceso nuevo
+# para que no cuenten los módulos ya importados, y termina con error si el total
+# pasa del presupuesto. Uso: python bench/importacion.py [--presupuesto-ms 1500]
+DIRECTORIO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PRESUPUESTO_MS = 1500
+LINEA = re.compile(r'import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)')
+
+
+def medir(codigo='import app'):
+    # Devuelve [(módulo, propio en µs, acumulado en µs, nivel de anidación)] en el orden de importtime
+    resultado = subprocess.run([sys.executable, '-X', 'importtime', '-c', codigo],
+                               cwd=DIRECTORIO, capture_output=True, text=True, check=True)
+    tiempos = []
+    for linea in resultado.stderr.splitlines():
+        coincidencia = LINEA.match(linea)
+        if coincidencia:
+            propio, acumulado, sangria, modulo = coincidencia.groups()
+            tiempos.append((modulo, int(propio), int(acumulado), len(sangria) // 2))
+    return tiempos
+
+
+def total_us(tiempos):
+    # Suma de los acumulados de las importaciones de primer nivel
+    return sum(acumulado for _, _, acumulado, nivel in tiempos if nivel == 0)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Mide el tiempo de importación de la app con python -X importtime")
+    parser.add_argument('--codigo', default='import app', help="código a medir (por omisión, import app)")
+    parser.add_argument('--presupuesto-ms', type=float, default=PRESUPUESTO_MS)
+    parser.add_argument('--top', type=int, default=15, help="módulos más lentos a mostrar")
+    args = parser.parse_args()
+
+    tiempos = medir(args.codigo)
+    total = total_us(tiempos) / 1000
+    modulos = {modulo for modulo, _, _, _ in tiempos}
+
+    print(f"{'módulo':40} {'propio ms':>10} {'acumulado ms':>13}")
+    for modulo, propio, acumulado, _ in sorted(tiempos, key=lambda t: t[1], reverse=True)[:args.top]:
+        print(f"{modulo:40} {propio / 1000:10.1f} {acumulado / 1000:13.1f}")
+    print(f"\nTotal: {total:.0f} ms (presupuesto {args.presupuesto_ms:.0f} ms), {len(modulos)} módulos")
+    for pesado in ('pandas', 'plotly.express', 'plotly.graph_objects'):
+        if pesado in modulos:
+            print(f"Aviso: se importa {pesado}")
+
+    if total > args.presupuesto_ms:
+        sys.exit(f"Se pasó del presupuesto de importación por {total - args.presupuesto_ms:.0f} ms")
@@ -0,0 +1,83 @@
+import argparse
+import json
+import os
+import sys
+
+import numpy as np
+
+# Se ejecuta como python bench/reproducir.py desde Dashbord-Codigo
+DIRECTORIO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, DIRECTORIO)
+os.chdir(DIRECTORIO)
+
+from app import create_app
+
+
+# Vuelve a enviar las llamadas guardadas en una traza (config['traza'] o DASHBOARD_TRAZA) a una
+# app local y compara las fases medidas ahora con las de la traza:
+#   python bench/reproducir.py traza.jsonl [--callback update_graph] [--minimo-ms 100] [--repeticiones 5]
+# Antes de cada repetición se vacía la caché de figuras (también la compartida), porque si no
+# todas menos la primera serían aciertos y no se reproduciría la llamada lenta; con --con-cache
+# se mide lo que vería un usuario que repite la misma selección.
+
+
+def leer_traza(ruta, callback=None, minimo_ms=0):
+    with open(ruta, encoding='utf-8') as f:
+        for linea in f:
+            registro = json.loads(linea)
+            if callback and registro['callback'] != callback:
+                continue
+            if registro['ms'].get('total', 0) < minimo_ms:
+                continue
+            yield registro
+
+
+def fases(encabezado):
+    # 'filtrar;dur=0.412, total;dur=4.012' -> {'filtrar': 0.412, 'total': 4.012}
+    medidas = {}
+    for parte in (encabezado or '').split(','):
+        nombre, _, duracion = parte.strip().partition(';dur=')
+        if duracion:
+            medidas[nombre] = float(duracion)
+    return medidas
+
+
+def vaciar_cache(app):
+    app.cache_figuras.limpiar()
+    if app.cache_figuras.compartida is not None:
+        app.cache_figuras.compartida.limpiar()
+
+
+def reproducir(app, cliente, registro, repeticiones, con_cache=False):
+    # Mediana de cada fase en las repeticiones
+    medidas = []
+    for _ in range(repeticiones):
+        if not con_cache:
+            vaciar_cache(app)
+        respuesta = cliente.post('/_dash-update-component', json=registro['peticion'])
+        medidas.append(fases(respuesta.headers.get('Server-Timing')))
+    nombres = dict.fromkeys(nombre for medida in medidas for nombre in medida)
+    return respuesta.status_code, {nombre: float(np.median([medida.get(nombre, 0.0) for medida in medidas])) for nombre in nombres}
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Reproduce las llamadas de una traza de callbacks y compara sus tiempos")
+    parser.add_argument('traza')
+    parser.add_argument('--callback', help="Sólo las llamadas a este callback")
+    parser.add_argument('--minimo-ms', type=float, default=0, help="Sólo las llamadas que tardaron al menos esto")
+    parser.add_argument('--repeticiones', type=int, default=5)
+    parser.add_argument('--paquete', help="Paquete de datos distinto al de config.py")
+    parser.add_argument('--con-cache', action='store_true', help="No vaciar la caché de figuras entre repeticiones")
+    args = parser.parse_args()
+
+    config = {'precargar': True, 'server_timing': True}
+    if args.paquete:
+        config['paquete'] = args.paquete
+    app = create_app(config)
+    cliente = app.server.test_client()
+
+    for registro in leer_traza(args.traza, args.callback, args.minimo_ms):
+        estado, medidas = reproducir(app, cliente, registro, args.repeticiones, args.con_cache)
+        print(f"{registro['fecha']} {registro['callback']} {json.dumps(registro['entradas'], ensure_ascii=False)}")
+        print(f"  HTTP {estado}  " + '  '.join(f"{nombre} {registro['ms'].get(nombre, 0):.2f} -> {ms:.2f} ms"
+                                               for nombre, ms in medidas.items()))
@@ -0,0 +1,108 @@
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import numpy as np
+
+# Se ejecuta como python bench/serializacion.py desde Dashbord-Codigo
+DIRECTORIO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, DIRECTORIO)
+os.chdir(DIRECTORIO)
+
+from app import create_app
+from bench.callbacks import escalar, escenarios, percentil
+from datos import CSV, leer_csv
+from geometria import NIVELES, leer_nivel
+from paquete import escribir_paquete
+from serializacion import SERIALIZADORES
+
+
+# Compara los serializadores de serializacion.SERIALIZADORES sobre las respuestas reales de
+# los callbacks (las mismas llamadas que bench/callbacks.py) a varias escalas de datos y
+# comprueba que todos produzcan el mismo texto:
+#   python bench/serializacion.py [--escalas 1 100] [--repeticiones 50]
+ESCALAS = (1, 100)
+SALIDA = 'bench/resultados/serializacion.json'
+
+
+def respuestas(app, repeticiones):
+    # {escenario: [valores devueltos por el callback]}
+    resultado = {}
+    for nombre, (funcion, argumentos, preparar) in escenarios(app, repeticiones).items():
+        valores = []
+        for i, args in enumerate(argumentos):
+            preparar(i)
+            valores.append(funcion(*args))
+        resultado[nombre] = valores
+    return resultado
+
+
+def medir(serializar, valores, vueltas):
+    tiempos = []
+    for _ in range(vueltas):
+        for valor in valores:
+            inicio = time.perf_counter()
+            serializar(valor)
+            tiempos.append(time.perf_counter() - inicio)
+    return {'p50_ms': percentil(tiempos, 50), 'p95_ms': percentil(tiempos, 95)}
+
+
+def medir_escala(base, factor, repeticiones, vueltas, directorio):
+    ruta = os.path.join(directorio, f'escala-{factor}.paquete')
+    escribir_paquete(escalar(base, factor), {nivel: leer_nivel(nivel) for nivel in NIVELES}, ruta)
+    app = create_app({'paquete': ruta, 'csv': os.path.join(directorio, 'sin-csv.csv'), 'precargar': True})
+
+    resultado = {'escala': factor, 'escenarios': {}}
+    for nombre, valores in respuestas(app, repeticiones).items():
+        textos = {serializador: [serializar(valor) for valor in valores] for serializador, serializar in SERIALIZADORES.items()}
+        referencia = textos['plotly']
+        resultado['escenarios'][nombre] = {
+            'bytes_p50': int(np.median([len(texto) for texto in referencia])),
+            'iguales': all(otros == referencia for otros in textos.values()),
+            **{serializador: medir(serializar, valores, vueltas) for serializador, serializar in SERIALIZADORES.items()},
+        }
+    os.remove(ruta)
+    return resultado
+
+
+def imprimir(resultado):
+    print(f"\nEscala {resultado['escala']}x (p50 ms por respuesta)")
+    print(f"  {'callback':38} {'bytes':>9} " + ' '.join(f'{nombre:>9}' for nombre in SERIALIZADORES) + '  iguales')
+    for nombre, medida in resultado['escenarios'].items():
+        print(f"  {nombre:38} {medida['bytes_p50']:9d} "
+              + ' '.join(f"{medida[serializador]['p50_ms']:9.3f}" for serializador in SERIALIZADORES)
+              + f"  {'sí' if medida['iguales'] else 'NO'}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Compara el tiempo de los serializadores JSON sobre las respuestas de los callbacks")
+    parser.add_argument('--csv', default=CSV)
+    parser.add_argument('--escalas', type=int, nargs='+', default=list(ESCALAS))
+    parser.add_argument('--repeticiones', type=int, default=50, help="Llamadas distintas por callback")
+    parser.add_argument('--vueltas', type=int, default=5, help="Veces que se serializa cada respuesta")
+    parser.add_argument('--salida', default=SALIDA)
+    args = parser.parse_args()
+
+    base = leer_csv(args.csv)
+    resultados = {
+        'fecha': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'plataforma': platform.platform(),
+        'serializadores': list(SERIALIZADORES),
+        'escalas': [],
+    }
+    with tempfile.TemporaryDirectory() as directorio:
+        for factor in args.escalas:
+            resultado = medir_escala(base, factor, args.repeticiones, args.vueltas, directorio)
+            imprimir(resultado)
+            resultados['escalas'].append(resultado)
+
+    os.makedirs(os.path.dirname(args.salida) or '.', exist_ok=True)
+    with open(args.salida, 'w', encoding='utf-8') as f:
+        json.dump(resultados, f, ensure_ascii=False, indent=2)
+    print(f"\nResultados en {args.salida}")
@@ -0,0 +1,169 @@
+import argparse
+import csv
+import json
+import math
+import os
+import sys
+
+import numpy as np
+
+# Se ejecuta como python bench/sintetico.py desde Dashbord-Codigo
+DIRECTORIO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, DIRECTORIO)
+os.chdir(DIRECTORIO)
+
+from cubo import DIMENSIONES, MESES
+from datos import COLUMNAS, CSV, leer_csv
+
+
+# Generador de datos sintéticos con la forma de datos-graficas.csv para pruebas de carga y
+# de escala. Aprende del CSV real la taxonomía, qué combinaciones aparecen en cada municipio,
+# la probabilidad de que un mes sea cero y la distribución de los conteos distintos de cero;
+# luego escribe fila por fila tantos años, municipios y modalidades como se pidan,
+# sin armar el conjunto completo en memoria, junto con un GeoJSON de cuadros por municipio.
+#   python bench/sintetico.py --years 30 --municipios 500 --salida-csv /tmp/grande.csv \
+#       --salida-geojson /tmp/grande.geojson
+#   python paquete.py --csv /tmp/grande.csv --geojson /tmp/grande.geojson --salida /tmp/grande.paquete
+
+# Rectángulo aproximado del estado de Campeche donde se acomodan los municipios sintéticos
+LIMITES = {'oeste': -92.5, 'este': -89.1, 'sur': 17.8, 'norte': 20.9}
+
+
+class ModeloSintetico:
+    # Estadísticas por municipio real y por combinación de la taxonomía (bien, tipo, subtipo, modalidad):
+    #   presencia: fracción de los años en los que la combinación aparece en el municipio
+    #   no_cero: probabilidad de que cada mes tenga un conteo distinto de cero
+    #   muestras: los conteos distintos de cero observados, de donde se sortean los nuevos
+    # Cada municipio sintético toma como plantilla uno real elegido al azar, así se conservan
+    # las diferencias entre municipios grandes y pequeños.
+
+    def __init__(self, df):
+        dimensiones = list(DIMENSIONES.values())
+        conteos = df[MESES].to_numpy(dtype=np.int64)
+
+        self.municipios = list(dict.fromkeys(df['Municipio'].astype(str)))
+        self.primer_year = int(df['Año'].min())
+        self.combinaciones = [tuple(str(valor) for valor in combinacion)
+                              for combinacion in df.groupby(dimensiones, sort=False, observed=True).indices]
+        posicion_municipio = {municipio: i for i, municipio in enumerate(self.municipios)}
+        posicion_combinacion = {combinacion: i for i, combinacion in enumerate(self.combinaciones)}
+
+        forma = (len(self.municipios), len(self.combinaciones))
+        self.presencia = np.zeros(forma)
+        self.no_cero = np.zeros(forma + (len(MESES),))
+        self._muestras = [[np.zeros(0, dtype=np.int64)] * forma[1] for _ in range(forma[0])]
+        years = df['Año'].nunique()
+        for (municipio, *combinacion), filas in df.groupby(['Municipio'] + dimensiones, sort=False, observed=True).indices.items():
+            i = posicion_municipio[str(municipio)]
+            j = posicion_combinacion[tuple(str(valor) for valor in combinacion)]
+            valores = conteos[filas]
+            self.presencia[i, j] = len(filas) / years
+            self.no_cero[i, j] = (valores > 0).mean(axis=0)
+            self._muestras[i][j] = valores[valores > 0]
+        self._indexar_muestras()
+
+    def _indexar_muestras(self):
+        # Todas las muestras en un solo arreglo con el inicio y la longitud de cada par
+        # (municipio, combinación), para sortear un bloque completo sin recorrer las combinaciones
+        planas = [muestras if len(muestras) else np.ones(1, dtype=np.int64)
+                  for por_municipio in self._muestras for muestras in por_municipio]
+        longitudes = np.array([len(muestras) for muestras in planas])
+        self._longitudes = longitudes.reshape(self.presencia.shape)
+        self._inicios = np.concatenate([[0], np.cumsum(longitudes)[:-1]]).reshape(self.presencia.shape)
+        self._todas = np.concatenate(planas)
+
+    def agregar_modalidades(self, cantidad, rng):
+        # Modalidades nuevas bajo subtipos existentes, con las estadísticas de una modalidad
+        # hermana elegida al azar
+        for k in range(cantidad):
+            origen = int(rng.integers(len(self.combinaciones)))
+            bien, tipo, subtipo, _ = self.combinaciones[origen]
+            self.combinaciones.append((bien, tipo, subtipo, f"Modalidad sintética {k + 1}"))
+            self.presencia = np.concatenate([self.presencia, self.presencia[:, origen, None]], axis=1)
+            self.no_cero = np.concatenate([self.no_cero, self.no_cero[:, origen, None]], axis=1)
+            for por_municipio in self._muestras:
+                por_municipio.append(por_municipio[origen])
+        self._indexar_muestras()
+
+    def nombres_municipios(self, cantidad):
+        # Los municipios reales primero y después "Municipio N"
+        return [self.municipios[i] if i < len(self.municipios) else f"Municipio {i + 1}" for i in range(cantidad)]
+
+    def bloque(self, plantilla, rng):
+        # Conteos de un municipio en un año según el municipio real `plantilla`:
+        # (combinaciones presentes, conteos de los 12 meses)
+        presentes = np.flatnonzero(rng.random(len(self.combinaciones)) < self.presencia[plantilla])
+        distintos = rng.random((len(presentes), len(MESES))) < self.no_cero[plantilla, presentes]
+        sorteo = (rng.random(distintos.shape) * self._longitudes[plantilla, presentes, None]).astype(np.int64)
+        valores = np.where(distintos, self._todas[self._inicios[plantilla, presentes, None] + sorteo], 0)
+        return presentes, valores
+
+    def filas(self, years, municipios, semilla=0):
+        # Genera las filas en el orden del CSV real: año, municipio, combinación.
+        # Los municipios reales usan sus propias estadísticas; los demás, las de uno al azar
+        rng = np.random.default_rng(semilla)
+        plantillas = [i if i < len(self.municipios) else int(rng.integers(len(self.municipios)))
+                      for i in range(len(municipios))]
+        for i in range(years):
+            year = self.primer_year + i
+            for municipio, plantilla in zip(municipios, plantillas):
+                presentes, valores = self.bloque(plantilla, rng)
+                for combinacion, conteos in zip(presentes, valores.tolist()):
+                    yield [year, municipio, *self.combinaciones[combinacion], *conteos]
+
+
+def escribir_csv(modelo, ruta, years, municipios, semilla=0):
+    with open(ruta, 'w', newline='', encoding='utf-8') as f:
+        escritor = csv.writer(f, quoting=csv.QUOTE_ALL)
+        escritor.writerow(COLUMNAS)
+        filas = 0
+        for fila in modelo.filas(years, municipios, semilla):
+            escritor.writerow(fila)
+            filas += 1
+    return filas
+
+
+def escribir_geojson(ruta, municipios):
+    # Un cuadro por municipio en una cuadrícula sobre Campeche, con la propiedad NOM_MUN que usa el mapa
+    columnas = math.ceil(math.sqrt(len(municipios)))
+    filas = math.ceil(len(municipios) / columnas)
+    ancho = (LIMITES['este'] - LIMITES['oeste']) / columnas
+    alto = (LIMITES['norte'] - LIMITES['sur']) / filas
+    with open(ruta, 'w', encoding='utf-8') as f:
+        f.write('{"type":"FeatureCollection","features":[\n')
+        for i, municipio in enumerate(municipios):
+            fila, columna = divmod(i, columnas)
+            oeste = round(LIMITES['oeste'] + columna * ancho, 6)
+            este = round(oeste + ancho, 6)
+            norte = round(LIMITES['norte'] - fila * alto, 6)
+            sur = round(norte - alto, 6)
+            feature = {
+                'type': 'Feature',
+                'properties': {'NOM_MUN': municipio},
+                'geometry': {'type': 'Polygon', 'coordinates': [[[oeste, sur], [este, sur], [este, norte], [oeste, norte], [oeste, sur]]]},
+            }
+            f.write((',\n' if i else '') + json.dumps(feature, ensure_ascii=False, separators=(',', ':')))
+        f.write('\n]}\n')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Genera datos sintéticos con la forma y la distribución de datos-graficas.csv")
+    parser.add_argument('--csv', default=CSV, help="CSV real del que se aprende el modelo")
+    parser.add_argument('--years', type=int, default=10)
+    parser.add_argument('--municipios', type=int, default=13)
+    parser.add_argument('--modalidades-extra', type=int, default=0)
+    parser.add_argument('--semilla', type=int, default=0)
+    parser.add_argument('--salida-csv', required=True)
+    parser.add_argument('--salida-geojson', help="GeoJSON con un cuadro por municipio")
+    args = parser.parse_args()
+
+    modelo = ModeloSintetico(leer_csv(args.csv))
+    modelo.agregar_modalidades(args.modalidades_extra, np.random.default_rng(args.semilla))
+    municipios = modelo.nombres_municipios(args.municipios)
+
+    filas = escribir_csv(modelo, args.salida_csv, args.years, municipios, args.semilla)
+    print(f"{args.salida_csv}: {filas} filas, {args.years} años, {len(municipios)} municipios, "
+          f"{len(modelo.combinaciones)} combinaciones, {os.path.getsize(args.salida_csv) / 1e6:.1f} MB")
+    if args.salida_geojson:
+        escribir_geojson(args.salida_geojson, municipios)
+        print(f"{args.salida_geojson}: {len(municipios)} municipios")
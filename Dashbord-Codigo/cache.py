@@ -0,0 +1,305 @@
+import functools
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+from serializacion import Serializado, serializar
+
+
+def normalizar(valor):
+    # Convierte los argumentos en una clave estable: escalares de NumPy a Python y listas a tuplas
+    if isinstance(valor, np.generic):
+        return valor.item()
+    if isinstance(valor, (list, tuple)):
+        return tuple(normalizar(v) for v in valor)
+    return valor
+
+
+def _serializar(resultado):
+    # Una tupla de figuras se guarda como sus textos separados por saltos de línea: el JSON
+    # compacto de los serializadores sólo lleva saltos de línea escapados dentro de las cadenas
+    if isinstance(resultado, tuple):
+        return '\n'.join(serializar(parte) for parte in resultado)
+    return serializar(resultado)
+
+
+def _serializado(texto):
+    if '\n' in texto:
+        return tuple(Serializado(parte) for parte in texto.split('\n'))
+    return Serializado(texto)
+
+
+class CacheFiguras:
+    # Caché LRU de figuras ya serializadas, acotada por número de entradas y por bytes.
+    # Guarda el JSON (no los objetos de Plotly) para que un acierto no toque pandas
+    # ni Plotly y para poder medir el tamaño real de lo que se guarda.
+
+    # Con `compartida` (una CacheCompartida) hay un segundo nivel en disco común a todos los
+    # workers: lo que no está en memoria se busca ahí, y lo que se calcula se guarda en los dos.
+
+    def __init__(self, max_entradas=512, max_bytes=64 * 1024 * 1024, compartida=None):
+        self.max_entradas = max_entradas
+        self.max_bytes = max_bytes
+        self.compartida = compartida
+        # {nombre: función sin memoizar} de cada memoizar, para calcular entradas por adelantado
+        self.funciones = {}
+        self._entradas = OrderedDict()
+        self._bytes = 0
+        self._candado = threading.Lock()
+        self.aciertos = 0
+        self.aciertos_compartida = 0
+        self.fallos = 0
+        self.desalojos = 0
+
+    def obtener(self, clave):
+        with self._candado:
+            texto = self._entradas.get(clave)
+            if texto is not None:
+                self._entradas.move_to_end(clave)
+                self.aciertos += 1
+                return texto
+        if self.compartida is not None:
+            texto = self.compartida.obtener(clave)
+            if texto is not None:
+                self._guardar_local(clave, texto)
+                with self._candado:
+                    self.aciertos_compartida += 1
+                return texto
+        with self._candado:
+            self.fallos += 1
+        return None
+
+    def contiene(self, clave):
+        # Como obtener pero sin contar aciertos ni fallos (lo usa calentamiento.py); lo que
+        # está en la caché compartida se trae a la de este proceso
+        with self._candado:
+            if clave in self._entradas:
+                return True
+        if self.compartida is not None:
+            texto = self.compartida.obtener(clave)
+            if texto is not None:
+                self._guardar_local(clave, texto)
+                return True
+        return False
+
+    def guardar(self, clave, texto):
+        self._guardar_local(clave, texto)
+        if self.compartida is not None:
+            self.compartida.guardar(clave, texto)
+
+    def _guardar_local(self, clave, texto):
+        tamano = len(texto)
+        if tamano > self.max_bytes:
+            return
+        with self._candado:
+            anterior = self._entradas.pop(clave, None)
+            if anterior is not None:
+                self._bytes -= len(anterior)
+            self._entradas[clave] = texto
+            self._bytes += tamano
+            while len(self._entradas) > self.max_entradas or self._bytes > self.max_bytes:
+                _, desalojado = self._entradas.popitem(last=False)
+                self._bytes -= len(desalojado)
+                self.desalojos += 1
+
+    def limpiar(self):
+        with self._candado:
+            self._entradas.clear()
+            self._bytes = 0
+
+    def estadisticas(self):
+        with self._candado:
+            return {
+                'entradas': len(self._entradas),
+                'bytes': self._bytes,
+                'aciertos': self.aciertos,
+                'aciertos_compartida': self.aciertos_compartida,
+                'fallos': self.fallos,
+                'desalojos': self.desalojos,
+            }
+
+    @staticmethod
+    def clave(nombre, instantanea, args):
+        return (nombre, normalizar(args), instantanea.version)
+
+    def calcular(self, nombre, instantanea, args):
+        # Texto de la entrada sin consultar ni llenar la caché
+        return _serializar(self.funciones[nombre](instantanea, *args))
+
+    def memoizar(self, nombre):
+        # Decorador para funciones cuyo primer argumento es la instantánea de los datos
+        # (tablero.Instantanea): la clave es el nombre, los demás argumentos normalizados y la
+        # versión de esa instantánea. Al publicarse otra, las entradas anteriores dejan de
+        # coincidir y salen por LRU; como la versión y los datos vienen del mismo objeto, nunca
+        # se guarda una figura con una versión que no le corresponde.
+        # Un acierto devuelve el texto guardado envuelto en serializacion.Serializado (una tupla
+        # de ellos si la función devuelve una tupla), que va a la respuesta sin decodificarse
+        def decorador(funcion):
+            self.funciones[nombre] = funcion
+
+            @functools.wraps(funcion)
+            def envoltura(instantanea, *args):
+                clave = self.clave(nombre, instantanea, args)
+                texto = self.obtener(clave)
+                if texto is not None:
+                    return _serializado(texto)
+                resultado = funcion(instantanea, *args)
+                self.guardar(clave, _serializar(resultado))
+                return resultado
+            return envoltura
+        return decorador
+
+
+class CacheCompartida:
+    # Caché de figuras serializadas en un archivo SQLite que comparten todos los workers
+    # (y los reinicios), sin servicios externos. La clave es la misma de CacheFiguras (nombre,
+    # argumentos y versión de los datos) escrita como JSON. Cada escritura es una transacción,
+    # así que otro proceso nunca lee una entrada a medias; con WAL las lecturas no esperan a
+    # las escrituras. Las entradas vencen `ttl` segundos después de guardarse y, si el total
+    # pasa de `max_bytes`, se borran las usadas hace más tiempo. La hora de uso se actualiza
+    # a lo más cada USO_MINIMO segundos por entrada para que leer no escriba en cada acierto.
+    # Un error de SQLite (archivo bloqueado demasiado tiempo, disco lleno) cuenta como fallo:
+    # la caché nunca hace fallar un callback.
+    USO_MINIMO = 30
+    # Forma en que se guardan los textos (ver _serializar); va en la clave para que un archivo
+    # escrito con otra no se lea
+    FORMATO = 2
+
+    ESQUEMA = """
+        CREATE TABLE IF NOT EXISTS figuras (
+            clave TEXT PRIMARY KEY,
+            texto TEXT NOT NULL,
+            bytes INTEGER NOT NULL,
+            creado REAL NOT NULL,
+            usado REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS figuras_usado ON figuras (usado);
+        CREATE TABLE IF NOT EXISTS total (id INTEGER PRIMARY KEY CHECK (id = 0), bytes INTEGER NOT NULL);
+        INSERT OR IGNORE INTO total VALUES (0, 0);
+        CREATE TRIGGER IF NOT EXISTS figuras_insertar AFTER INSERT ON figuras
+            BEGIN UPDATE total SET bytes = bytes + NEW.bytes; END;
+        CREATE TRIGGER IF NOT EXISTS figuras_actualizar AFTER UPDATE OF bytes ON figuras
+            BEGIN UPDATE total SET bytes = bytes + NEW.bytes - OLD.bytes; END;
+        CREATE TRIGGER IF NOT EXISTS figuras_borrar AFTER DELETE ON figuras
+            BEGIN UPDATE total SET bytes = bytes - OLD.bytes; END;
+    """
+
+    def __init__(self, ruta, max_bytes=256 * 1024 * 1024, ttl=24 * 3600):
+        self.ruta = ruta
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        # Una conexión por hilo y por proceso: las conexiones de SQLite no se comparten
+        # entre hilos ni sobreviven al fork de gunicorn. El proceso que va a hacer fork la cierra
+        # antes (cerrar); si aun así un hijo hereda una abierta, se guarda en `_heredadas` sin
+        # usarla ni cerrarla, porque SQLite no admite cerrar en el hijo una conexión del padre
+        self._local = threading.local()
+        self._heredadas = []
+        self._candado = threading.Lock()
+        self.errores = 0
+        with self._conexion() as conexion:
+            conexion.executescript(self.ESQUEMA)
+
+    def _conexion(self):
+        conexion = getattr(self._local, 'conexion', None)
+        if conexion is None or self._local.pid != os.getpid():
+            if conexion is not None:
+                self._heredadas.append(conexion)
+            conexion = sqlite3.connect(self.ruta, timeout=5, isolation_level=None)
+            conexion.execute('PRAGMA journal_mode=WAL')
+            conexion.execute('PRAGMA synchronous=NORMAL')
+            self._local.conexion = conexion
+            self._local.pid = os.getpid()
+        return conexion
+
+    def cerrar(self):
+        # Cierra la conexión de este hilo; la siguiente operación abre otra. Se llama antes de
+        # un fork (create_app al terminar de precargar, calentamiento.py antes de su pool)
+        conexion = getattr(self._local, 'conexion', None)
+        if conexion is not None and self._local.pid == os.getpid():
+            conexion.close()
+        self._local.conexion = None
+
+    def _clave(self, clave):
+        return json.dumps([self.FORMATO, *clave], ensure_ascii=False, separators=(',', ':'))
+
+    def _error(self, error):
+        with self._candado:
+            self.errores += 1
+        print(f"{self.ruta}: {error}", file=sys.stderr)
+
+    def obtener(self, clave):
+        clave = self._clave(clave)
+        ahora = time.time()
+        try:
+            conexion = self._conexion()
+            fila = conexion.execute('SELECT texto, creado, usado FROM figuras WHERE clave = ?', (clave,)).fetchone()
+            if fila is None:
+                return None
+            texto, creado, usado = fila
+            if creado + self.ttl < ahora:
+                conexion.execute('DELETE FROM figuras WHERE clave = ? AND creado = ?', (clave, creado))
+                return None
+            if ahora - usado > self.USO_MINIMO:
+                conexion.execute('UPDATE figuras SET usado = ? WHERE clave = ?', (ahora, clave))
+            return texto
+        except sqlite3.Error as error:
+            self._error(error)
+            return None
+
+    def guardar(self, clave, texto):
+        tamano = len(texto.encode('utf-8'))
+        if tamano > self.max_bytes:
+            return
+        ahora = time.time()
+        try:
+            conexion = self._conexion()
+            # BEGIN IMMEDIATE toma el bloqueo de escritura al empezar: la entrada nueva, las
+            # vencidas y los desalojos se aplican juntos o no se aplica nada
+            conexion.execute('BEGIN IMMEDIATE')
+            try:
+                conexion.execute('INSERT INTO figuras (clave, texto, bytes, creado, usado) VALUES (?, ?, ?, ?, ?) '
+                                 'ON CONFLICT (clave) DO UPDATE SET texto = excluded.texto, bytes = excluded.bytes, '
+                                 'creado = excluded.creado, usado = excluded.usado',
+                                 (self._clave(clave), texto, tamano, ahora, ahora))
+                (total,) = conexion.execute('SELECT bytes FROM total').fetchone()
+                if total > self.max_bytes:
+                    self._desalojar(conexion, total - self.max_bytes, ahora)
+                conexion.execute('COMMIT')
+            except BaseException:
+                conexion.execute('ROLLBACK')
+                raise
+        except sqlite3.Error as error:
+            self._error(error)
+
+    def _desalojar(self, conexion, exceso, ahora):
+        # Primero las vencidas y después las usadas hace más tiempo hasta liberar `exceso` bytes
+        exceso -= conexion.execute('SELECT COALESCE(SUM(bytes), 0) FROM figuras WHERE creado < ?', (ahora - self.ttl,)).fetchone()[0]
+        conexion.execute('DELETE FROM figuras WHERE creado < ?', (ahora - self.ttl,))
+        claves = []
+        for clave, tamano in conexion.execute('SELECT clave, bytes FROM figuras ORDER BY usado'):
+            if exceso <= 0:
+                break
+            claves.append((clave,))
+            exceso -= tamano
+        conexion.executemany('DELETE FROM figuras WHERE clave = ?', claves)
+
+    def limpiar(self):
+        try:
+            self._conexion().execute('DELETE FROM figuras')
+        except sqlite3.Error as error:
+            self._error(error)
+
+    def estadisticas(self):
+        try:
+            entradas, = self._conexion().execute('SELECT COUNT(*) FROM figuras').fetchone()
+            total, = self._conexion().execute('SELECT bytes FROM total').fetchone()
+        except sqlite3.Error as error:
+            self._error(error)
+            entradas = total = 0
+        return {'entradas': entradas, 'bytes': total, 'errores': self.errores}
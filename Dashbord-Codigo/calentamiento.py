@@ -0,0 +1,97 @@
+import multiprocessing
+import os
+import sys
+import time
+
+import numpy as np
+
+
+# Calentamiento de la caché de figuras (cache.CacheFiguras): calcula por adelantado las
+# figuras de las selecciones más consultadas para que la primera petición de cada una ya sea
+# un acierto. Se hace al crear la app (con precargar, en el maestro de gunicorn antes de
+# crear los workers, que heredan la caché) y después de cada recarga o novedad
+# (tablero.DatosTablero.al_publicar), porque la versión nueva deja sin aciertos a la anterior.
+# El orden es: todas las figuras del Inicio (año × delito, es la primera página) y después
+# las gráficas de Estadísticas sin modalidad, de la selección con más delitos a la de menos.
+# Se calculan hasta `maximo` entradas; lo que ya está en la caché (o en la compartida) se salta.
+# Al crear la app se reparten entre `procesos` procesos con fork; después de una recarga se
+# calculan en el hilo de la ingesta, porque no se hace fork de un worker con hilos.
+
+
+def combinaciones(instantanea):
+    # [(nombre de la función memoizada, argumentos)] en orden de prioridad
+    taxonomia = instantanea.taxonomia
+    cubo = instantanea.cubo
+    lista = [('inicio', (int(year), delito)) for year in instantanea.years for delito in taxonomia.tipos()]
+
+    # Estadísticas: un total por año y municipio para cada rama de la taxonomía; las
+    # celdas sin filas no se calculan (el callback devuelve "No hay datos")
+    estadisticas = []
+    for bien in taxonomia.bienes():
+        for tipo in taxonomia.delitos(bien):
+            for subtipo in taxonomia.subdelitos(tipo):
+                totales, presente = cubo.sumar(agrupar=('Año', 'Municipio'), bien=bien, tipo=tipo, subtipo=subtipo)
+                for i, j in zip(*np.nonzero(presente)):
+                    estadisticas.append((-int(totales[i, j]), len(estadisticas),
+                                         ('estadisticas', (bien, str(cubo.municipios[j]), int(cubo.years[i]), tipo, subtipo, None))))
+    estadisticas.sort()
+    lista.extend(combinacion for _, _, combinacion in estadisticas)
+    return lista
+
+
+# (caché, instantánea) de los procesos del calentamiento; se heredan con fork en lugar de
+# enviarse con pickle
+_TRABAJO = None
+
+
+def _calcular(combinacion):
+    cache_figuras, instantanea = _TRABAJO
+    nombre, args = combinacion
+    return cache_figuras.clave(nombre, instantanea, args), cache_figuras.calcular(nombre, instantanea, args)
+
+
+class Calentamiento:
+
+    def __init__(self, cache_figuras, procesos=None, maximo=None):
+        self.cache_figuras = cache_figuras
+        self.procesos = procesos or os.cpu_count() or 1
+        # Por omisión tantas entradas como caben en la caché en memoria
+        self.maximo = maximo or cache_figuras.max_entradas
+        self.calculadas = 0
+        self.segundos = 0.0
+
+    def calentar(self, instantanea, procesos=None):
+        # Devuelve cuántas figuras se calcularon
+        global _TRABAJO
+        inicio = time.perf_counter()
+        cache_figuras = self.cache_figuras
+        pendientes = [(nombre, args) for nombre, args in combinaciones(instantanea)[:self.maximo]
+                      if not cache_figuras.contiene(cache_figuras.clave(nombre, instantanea, args))]
+        procesos = min(procesos or self.procesos, len(pendientes))
+
+        if procesos > 1:
+            # Los procesos no usan la caché compartida, pero no deben heredar su conexión abierta
+            if cache_figuras.compartida is not None:
+                cache_figuras.compartida.cerrar()
+            _TRABAJO = (cache_figuras, instantanea)
+            try:
+                with multiprocessing.get_context('fork').Pool(procesos) as pool:
+                    for clave, texto in pool.imap_unordered(_calcular, pendientes, chunksize=16):
+                        cache_figuras.guardar(clave, texto)
+            finally:
+                _TRABAJO = None
+        else:
+            for nombre, args in pendientes:
+                cache_figuras.guardar(cache_figuras.clave(nombre, instantanea, args),
+                                      cache_figuras.calcular(nombre, instantanea, args))
+
+        segundos = time.perf_counter() - inicio
+        self.calculadas += len(pendientes)
+        self.segundos += segundos
+        print(f"Caché de figuras: {len(pendientes)} figuras calculadas en {segundos:.1f} s "
+              f"(versión {instantanea.version}, {max(procesos, 1)} procesos)", file=sys.stderr)
+        return len(pendientes)
+
+    def al_publicar(self, instantanea):
+        # Para DatosTablero.al_publicar: en el hilo que publicó, sin fork
+        self.calentar(instantanea, procesos=1)
@@ -0,0 +1,111 @@
+import gzip
+import threading
+
+import flask
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+# Compresión negociada con Accept-Encoding de las respuestas del servidor Flask de la app:
+# brotli si está instalado (pip install brotli) y el navegador lo acepta, si no gzip.
+# Las respuestas de los callbacks, el layout y la página se comprimen en cada petición con un
+# nivel rápido y sólo a partir de minimo_bytes. Los archivos inmutables (la geometría versionada
+# de /geo, los assets y el JavaScript de Dash) se comprimen una sola vez con el nivel máximo y
+# se guardan las variantes. Las imágenes PNG ya vienen comprimidas con deflate y se envían tal cual.
+
+TIPOS = ('text/', 'application/json', 'application/javascript', 'application/geo+json', 'image/svg+xml')
+NIVEL_RAPIDO = {'br': 4, 'gzip': 6}
+NIVEL_MAXIMO = {'br': 11, 'gzip': 9}
+# Rutas (relativas al prefijo de la app) cuyo contenido no cambia para una misma URL y ETag
+INMUTABLES = ('geo/', 'assets/', '_dash-component-suites/')
+
+
+def codificaciones():
+    # En orden de preferencia cuando el navegador acepta varias con la misma calidad
+    return ('br', 'gzip') if brotli is not None else ('gzip',)
+
+
+def comprimir(contenido, codificacion, nivel):
+    if codificacion == 'br':
+        return brotli.compress(contenido, quality=nivel)
+    return gzip.compress(contenido, compresslevel=nivel, mtime=0)
+
+
+class Compresion:
+
+    def __init__(self, minimo_bytes=1024):
+        self.minimo_bytes = minimo_bytes
+        self._inmutables = ()
+        # {(ruta, etag, codificación): contenido comprimido, o None si no se reduce}
+        self._variantes = {}
+        self._candado = threading.Lock()
+
+    def instalar(self, app):
+        prefijo = app.config.routes_pathname_prefix
+        self._inmutables = tuple(prefijo + ruta for ruta in INMUTABLES)
+        app.server.after_request(self._despues_de_peticion)
+
+    def variante(self, ruta, etag, codificacion, leer):
+        # leer() devuelve el contenido sin comprimir; sólo se llama la primera vez
+        clave = (ruta, etag, codificacion)
+        if clave not in self._variantes:
+            contenido = bytes(leer())
+            comprimido = comprimir(contenido, codificacion, NIVEL_MAXIMO[codificacion])
+            with self._candado:
+                self._variantes[clave] = comprimido if len(comprimido) < len(contenido) else None
+        return self._variantes[clave]
+
+    def precomprimir(self, contenidos):
+        # {ruta: contenido} de rutas inmutables sin ETag (la geometría de /geo), p. ej. al
+        # precargar en el maestro de gunicorn para que los workers hereden las variantes
+        for ruta, contenido in contenidos.items():
+            for codificacion in codificaciones():
+                self.variante(ruta, None, codificacion, lambda: contenido)
+
+    def _despues_de_peticion(self, respuesta):
+        if not (respuesta.mimetype or '').startswith(TIPOS):
+            return respuesta
+        respuesta.vary.add('Accept-Encoding')
+        if (respuesta.status_code != 200 or flask.request.method == 'HEAD'
+                or 'Content-Encoding' in respuesta.headers
+                or 'no-transform' in respuesta.headers.get('Cache-Control', '')):
+            return respuesta
+        if respuesta.content_length is not None and respuesta.content_length < self.minimo_bytes:
+            return respuesta
+        codificacion = flask.request.accept_encodings.best_match(codificaciones())
+        if codificacion is None:
+            return respuesta
+
+        if flask.request.path.startswith(self._inmutables):
+            etag, _ = respuesta.get_etag()
+            comprimido = self.variante(flask.request.path, etag, codificacion, lambda: self._contenido(respuesta))
+            if comprimido is None:
+                return respuesta
+            # send_file entrega un archivo abierto que ya no se va a leer
+            if respuesta.direct_passthrough and hasattr(respuesta.response, 'close'):
+                respuesta.response.close()
+            respuesta.direct_passthrough = False
+        else:
+            contenido = respuesta.get_data()
+            if len(contenido) < self.minimo_bytes:
+                return respuesta
+            comprimido = comprimir(contenido, codificacion, NIVEL_RAPIDO[codificacion])
+            if len(comprimido) >= len(contenido):
+                return respuesta
+
+        respuesta.set_data(comprimido)
+        respuesta.headers['Content-Encoding'] = codificacion
+        respuesta.headers.pop('Accept-Ranges', None)
+        # La representación comprimida no es byte a byte la del ETag original
+        etag, debil = respuesta.get_etag()
+        if etag and not debil:
+            respuesta.set_etag(etag, weak=True)
+        return respuesta
+
+    @staticmethod
+    def _contenido(respuesta):
+        respuesta.direct_passthrough = False
+        return respuesta.get_data()
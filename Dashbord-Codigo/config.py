@@ -0,0 +1,47 @@
+# Configuración por omisión del tablero. create_app(config) recibe un diccionario con
+# los valores que se quieran cambiar; las rutas son relativas a Dashbord-Codigo.
+CONFIG = {
+    'csv': 'Data/datos-graficas.csv',
+    'paquete': 'Data/datos.paquete',
+    # Nivel de detalle de la geometría (geometria.NIVELES) del mapa principal y del de comparación
+    'nivel_mapa': 'medio',
+    'nivel_mapa_otra': 'bajo',
+    'cache_entradas': 512,
+    'cache_bytes': 64 * 1024 * 1024,
+    # Segundo nivel de la caché de figuras en un archivo SQLite común a todos los workers
+    # (cache.CacheCompartida); None: sólo la caché en memoria de cada proceso
+    'cache_compartida': None,
+    'cache_compartida_bytes': 256 * 1024 * 1024,
+    'cache_compartida_ttl': 24 * 3600,
+    # Cargar los datos al crear la app en lugar de en la primera petición (gunicorn con preload_app)
+    'precargar': False,
+    # Métricas por callback en /metrics (formato de Prometheus)
+    'metricas': False,
+    # Encabezado Server-Timing con las fases de cada callback
+    'server_timing': False,
+    # Ruta de una traza JSON lines con las fases y las entradas de cada callback (None: sin traza);
+    # con traza_minimo_ms > 0 sólo se guardan las llamadas más lentas que eso
+    'traza': None,
+    'traza_minimo_ms': 0,
+    # Compresión gzip/brotli negociada de las respuestas a partir de este tamaño
+    'compresion': True,
+    'compresion_minimo_bytes': 1024,
+    # Serializador de las respuestas (serializacion.SERIALIZADORES); None: orjson si está instalado
+    'serializador': None,
+    # Directorio de novedades que se integran sin reiniciar (ingesta.py) y cada cuántos
+    # segundos se revisa; None: sin ingesta
+    'ingesta': None,
+    'ingesta_intervalo': 5,
+    # Calcular las figuras más consultadas al arrancar y después de cada recarga (calentamiento.py):
+    # en cuántos procesos (None: uno por CPU) y cuántas como máximo (None: cache_entradas)
+    'calentamiento': False,
+    'calentamiento_procesos': None,
+    'calentamiento_maximo': None,
+}
+
+
+def configuracion(config=None):
+    desconocidas = set(config or {}) - set(CONFIG)
+    if desconocidas:
+        raise ValueError(f"Opciones de configuración desconocidas: {', '.join(sorted(desconocidas))}")
+    return {**CONFIG, **(config or {})}
@@ -0,0 +1,232 @@
+import numpy as np
+import pandas as pd
+
+from metricas import fase
+
+
+MESES = ['Enero', 'Febrero', 'Marzo', 'Abril', 'Mayo', 'Junio', 'Julio', 'Agosto', 'Septiembre', 'Octubre', 'Noviembre', 'Diciembre']
+
+# Columnas de la taxonomía de delitos y el nombre corto con el que se filtran en el cubo
+DIMENSIONES = {
+    'bien': 'Bien jurídico afectado',
+    'tipo': 'Tipo de delito',
+    'subtipo': 'Subtipo de delito',
+    'modalidad': 'Modalidad',
+}
+
+
+def _como_lista(valor):
+    if isinstance(valor, (list, tuple, set, np.ndarray, pd.Index)):
+        return list(valor)
+    return [valor]
+
+
+def _entero_mas_angosto(conteos):
+    return np.min_scalar_type(int(conteos.max()) if conteos.size else 0)
+
+
+class CuboDelitos:
+    # Cubo de conteos año × municipio × combinación de delito × mes con códigos enteros.
+    #
+    # Bien jurídico, tipo, subtipo y modalidad son jerárquicos, así que en lugar de un eje
+    # por columna (que sería casi todo ceros) se guarda un eje con cada combinación existente
+    # y una tabla `codigos` con el código de cada columna de la taxonomía por combinación.
+    # Filtrar por la taxonomía es una máscara sobre esa tabla pequeña y el resto es indexar
+    # y sumar arreglos de NumPy, sin recorrer las filas del CSV.
+
+    def __init__(self, df):
+        self.years = np.array(sorted(df['Año'].unique()))
+        self.municipios = np.array(sorted(df['Municipio'].unique()), dtype=object)
+        self.meses = list(MESES)
+
+        # Las combinaciones y las etiquetas conservan el orden de aparición en el CSV
+        combinaciones = df[list(DIMENSIONES.values())].drop_duplicates()
+        combo_codigos, combo_etiquetas = pd.factorize(pd.MultiIndex.from_frame(combinaciones), sort=False)
+        self.etiquetas = {}
+        self.indices = {}
+        codigos = []
+        for nombre, columna in DIMENSIONES.items():
+            codigo, etiquetas = pd.factorize(combinaciones[columna], sort=False)
+            self.etiquetas[nombre] = np.asarray(etiquetas, dtype=object)
+            self.indices[nombre] = {etiqueta: i for i, etiqueta in enumerate(self.etiquetas[nombre])}
+            codigos.append(codigo)
+        self.codigos = np.column_stack(codigos)
+        self._indice_combo = {tuple(combinacion): i for i, combinacion in enumerate(combo_etiquetas)}
+        self._indexar_ejes()
+
+        filas_year = df['Año'].map(self._indice_year).to_numpy()
+        filas_municipio = df['Municipio'].map(self._indice_municipio).to_numpy()
+        filas_combo = combo_etiquetas.get_indexer(pd.MultiIndex.from_frame(df[list(DIMENSIONES.values())]))
+
+        # Los conteos se suman primero por celda (sólo las que tienen filas) para guardarlos en el
+        # entero sin signo más angosto que admite el máximo, como la tabla compacta (datos.compactar);
+        # las sumas de sumar se hacen en int64
+        forma = (len(self.years), len(self.municipios), len(combo_etiquetas))
+        celdas, filas_celda = np.unique(np.ravel_multi_index((filas_year, filas_municipio, filas_combo), forma),
+                                        return_inverse=True)
+        sumas = np.zeros((len(celdas), len(MESES)), dtype=np.int64)
+        np.add.at(sumas, filas_celda, df[MESES].fillna(0).to_numpy(dtype=np.int64))
+        self.valores = np.zeros(forma + (len(MESES),), dtype=_entero_mas_angosto(sumas))
+        self.valores.reshape(-1, len(MESES))[celdas] = sumas
+        self.presente = np.zeros(forma, dtype=bool)
+        self.presente.reshape(-1)[celdas] = True
+        self._congelar()
+
+    def _congelar(self):
+        # El cubo no cambia una vez armado (integrar devuelve otro), así que una escritura por error falla
+        for arreglo in (self.valores, self.presente, self.codigos):
+            arreglo.flags.writeable = False
+
+    def _indexar_ejes(self):
+        self._indice_year = {year: i for i, year in enumerate(self.years)}
+        self._indice_municipio = {municipio: i for i, municipio in enumerate(self.municipios)}
+
+    def integrar(self, novedades):
+        # Cubo nuevo con archivos de novedades (ingesta.py) integrados en orden: `novedades` es una
+        # lista de (tabla, meses) y las filas de cada tabla reemplazan los meses `meses` de los años
+        # que trae; los demás meses y años no cambian. Este cubo queda intacto y los conteos se
+        # copian una sola vez para todos los archivos. Si traen años, municipios o combinaciones
+        # nuevos, los ejes se amplían.
+        combinaciones = list(dict.fromkeys(combinacion for df, _ in novedades
+                                           for combinacion in df[list(DIMENSIONES.values())].itertuples(index=False, name=None)))
+        years = list(dict.fromkeys(year for df, _ in novedades for year in pd.unique(df['Año']) if year not in self._indice_year))
+        municipios = list(dict.fromkeys(municipio for df, _ in novedades
+                                        for municipio in pd.unique(df['Municipio']) if municipio not in self._indice_municipio))
+        nuevas = [combinacion for combinacion in combinaciones if combinacion not in self._indice_combo]
+        cubo = self._ampliado(years, municipios, nuevas) if years or municipios or nuevas else self._copia()
+        for df, meses in novedades:
+            cubo._reemplazar(df, meses)
+        cubo._congelar()
+        return cubo
+
+    def _copia(self):
+        # Copia de los conteos y de las celdas presentes; los índices y las etiquetas no cambian
+        # al integrar sin ampliar, así que se comparten
+        cubo = object.__new__(CuboDelitos)
+        cubo.__dict__.update(self.__dict__)
+        cubo.valores = self.valores.copy()
+        cubo.presente = self.presente.copy()
+        return cubo
+
+    def _ampliado(self, years, municipios, combinaciones):
+        # Copia con los ejes ampliados: años y municipios se reordenan, las combinaciones
+        # nuevas van al final (el orden de aparición, como si vinieran al final del CSV)
+        cubo = object.__new__(CuboDelitos)
+        cubo.years = np.array(sorted([*self.years.tolist(), *years]))
+        cubo.municipios = np.array(sorted([*self.municipios, *municipios]), dtype=object)
+        cubo.meses = self.meses
+        cubo.etiquetas = {}
+        cubo.indices = {}
+        codigos = []
+        for k, nombre in enumerate(DIMENSIONES):
+            etiquetas = list(self.etiquetas[nombre])
+            indice = dict(self.indices[nombre])
+            for combinacion in combinaciones:
+                if combinacion[k] not in indice:
+                    indice[combinacion[k]] = len(etiquetas)
+                    etiquetas.append(combinacion[k])
+            cubo.etiquetas[nombre] = np.asarray(etiquetas, dtype=object)
+            cubo.indices[nombre] = indice
+            codigos.append([indice[combinacion[k]] for combinacion in combinaciones])
+        nuevos = np.array(codigos, dtype=self.codigos.dtype).reshape(len(DIMENSIONES), len(combinaciones)).T
+        cubo.codigos = np.concatenate([self.codigos, nuevos])
+        cubo._indice_combo = {**self._indice_combo, **{combinacion: len(self.codigos) + i for i, combinacion in enumerate(combinaciones)}}
+        cubo._indexar_ejes()
+
+        # Los datos actuales en sus nuevas posiciones
+        forma = (len(cubo.years), len(cubo.municipios), len(cubo.codigos))
+        cubo.valores = np.zeros(forma + (len(MESES),), dtype=self.valores.dtype)
+        cubo.presente = np.zeros(forma, dtype=bool)
+        posiciones = np.ix_([cubo._indice_year[year] for year in self.years],
+                            [cubo._indice_municipio[municipio] for municipio in self.municipios],
+                            np.arange(len(self.codigos)))
+        cubo.valores[posiciones] = self.valores
+        cubo.presente[posiciones] = self.presente
+        return cubo
+
+    def _reemplazar(self, df, meses):
+        # Sobre un cubo recién copiado o ampliado, que todavía nadie lee
+        filas_year = df['Año'].map(self._indice_year).to_numpy()
+        filas_municipio = df['Municipio'].map(self._indice_municipio).to_numpy()
+        filas_combo = np.array([self._indice_combo[combinacion] for combinacion in
+                                df[list(DIMENSIONES.values())].itertuples(index=False, name=None)], dtype=np.intp)
+        columnas = [MESES.index(mes) for mes in meses]
+        conteos = df[meses].fillna(0).to_numpy(dtype=np.int64)
+        for year in np.unique(filas_year):
+            filas = filas_year == year
+            bloque = np.zeros((len(self.municipios), len(self.codigos), len(meses)), dtype=np.int64)
+            np.add.at(bloque, (filas_municipio[filas], filas_combo[filas]), conteos[filas])
+            if bloque.size and bloque.max() > np.iinfo(self.valores.dtype).max:
+                # Un conteo que ya no cabe ensancha el entero de todo el cubo
+                self.valores = self.valores.astype(_entero_mas_angosto(bloque))
+            presente = np.zeros((len(self.municipios), len(self.codigos)), dtype=bool)
+            presente[filas_municipio[filas], filas_combo[filas]] = True
+            self.valores[year][:, :, columnas] = bloque
+            # Un año completo reemplaza también qué celdas tienen filas; unos meses sólo agregan
+            if len(meses) == len(MESES):
+                self.presente[year] = presente
+            else:
+                self.presente[year] |= presente
+
+    def _posiciones(self, indice, valores):
+        return np.array([indice[v] for v in _como_lista(valores) if v in indice], dtype=np.intp)
+
+    def seleccion(self, year=None, municipio=None, **filtros):
+        # Índices (años, municipios, combinaciones) que cumplen los filtros; None = sin filtro
+        years = np.arange(len(self.years)) if year is None else self._posiciones(self._indice_year, year)
+        municipios = np.arange(len(self.municipios)) if municipio is None else self._posiciones(self._indice_municipio, municipio)
+
+        mascara = np.ones(len(self.codigos), dtype=bool)
+        for nombre, valor in filtros.items():
+            if nombre not in DIMENSIONES:
+                raise TypeError(f"Filtro desconocido: {nombre}")
+            if valor is None:
+                continue
+            mascara &= np.isin(self.codigos[:, list(DIMENSIONES).index(nombre)], self._posiciones(self.indices[nombre], valor))
+        return years, municipios, np.flatnonzero(mascara)
+
+    def sumar(self, agrupar=(), **filtros):
+        # Suma los conteos de la selección conservando los ejes de `agrupar`
+        # ('Año', 'Municipio', 'Mes', en ese orden). Devuelve también qué celdas
+        # (año, municipio) tenían al menos una fila en el CSV.
+        with fase('filtrar'):
+            years, municipios, combos = self.seleccion(**filtros)
+            bloque = self.valores[np.ix_(years, municipios, combos)]
+            presente = self.presente[np.ix_(years, municipios, combos)]
+
+        with fase('agregar'):
+            ejes = tuple(i for i, eje in enumerate(('Año', 'Municipio', 'Combinación', 'Mes')) if eje not in agrupar)
+            totales = bloque.sum(axis=ejes, dtype=np.int64)
+            presente = presente.any(axis=2)
+            if 'Año' not in agrupar:
+                presente = presente.any(axis=0)
+            if 'Municipio' not in agrupar:
+                presente = presente.any(axis=-1)
+        return totales, presente
+
+    def totales_por_municipio(self, **filtros):
+        # Total anual por municipio, sólo con los municipios que aparecen en la selección
+        totales, presente = self.sumar(agrupar=('Municipio',), **filtros)
+        municipios = self.municipios if filtros.get('municipio') is None else self.municipios[self.seleccion(**filtros)[1]]
+        return municipios[presente], totales[presente]
+
+    def totales_mensuales(self, **filtros):
+        # Total por mes de la selección, o None si ninguna fila coincide
+        totales, presente = self.sumar(agrupar=('Mes',), **filtros)
+        if not presente:
+            return None
+        return totales
+
+    def comparar(self, years, por, **filtros):
+        # Totales de varios años en una sola reducción sobre el cubo.
+        # Devuelve los años encontrados (en el orden pedido), la matriz años × `por`
+        # ('Municipio' o 'Mes') y qué celdas tenían filas en el CSV.
+        years = [year for year in _como_lista(years) if year in self._indice_year]
+        totales, presente = self.sumar(agrupar=('Año', por), year=years, **filtros)
+        return years, totales, presente
+
+    def valores_dimension(self, nombre, **filtros):
+        # Etiquetas de una columna de la taxonomía presentes en las combinaciones filtradas
+        _, _, combos = self.seleccion(**filtros)
+        codigos = pd.unique(self.codigos[combos, list(DIMENSIONES).index(nombre)])
+        return self.etiquetas[nombre][codigos].tolist()
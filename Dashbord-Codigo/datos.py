@@ -0,0 +1,80 @@
+import argparse
+import hashlib
+
+import numpy as np
+import pandas as pd
+
+from cubo import MESES, DIMENSIONES
+
+
+CSV = 'Data/datos-graficas.csv'
+
+COLUMNAS = ['Año'] + ['Municipio'] + list(DIMENSIONES.values()) + MESES
+CATEGORICAS = ['Municipio'] + list(DIMENSIONES.values())
+
+
+def validar_tabla(df, meses=MESES):
+    # Con `meses` se valida una tabla que sólo trae algunos meses (las novedades de ingesta.py)
+    faltantes = [columna for columna in ['Año'] + CATEGORICAS + list(meses) if columna not in df.columns]
+    if faltantes:
+        raise ValueError(f"Faltan columnas en el CSV: {', '.join(faltantes)}")
+    vacias = [columna for columna in ['Año'] + CATEGORICAS if df[columna].isna().any()]
+    if vacias:
+        raise ValueError(f"Hay valores vacíos en: {', '.join(vacias)}")
+    conteos = df[list(meses)]
+    if not all(pd.api.types.is_numeric_dtype(conteos[mes]) for mes in meses):
+        raise ValueError("Los conteos mensuales deben ser numéricos")
+    if (conteos < 0).any().any() or (conteos.fillna(0) % 1 != 0).any().any():
+        raise ValueError("Los conteos mensuales deben ser enteros no negativos")
+
+
+def entero_mas_angosto(serie):
+    # Los meses sin reportar (vacíos en el CSV) cuentan como cero, igual que al sumarlos
+    valores = serie.fillna(0).to_numpy(dtype=np.int64)
+    maximo = int(valores.max()) if len(valores) else 0
+    return valores.astype(np.min_scalar_type(maximo))
+
+
+def compactar(df):
+    # Dimensiones como categorías (códigos int8/int16 más la lista de etiquetas)
+    # y conteos en el entero sin signo más angosto que admite su máximo
+    columnas = {}
+    for columna in COLUMNAS:
+        if columna in CATEGORICAS:
+            columnas[columna] = df[columna].astype('category')
+        else:
+            columnas[columna] = entero_mas_angosto(df[columna])
+    return pd.DataFrame(columnas, index=pd.RangeIndex(len(df)))
+
+
+def leer_csv(ruta=CSV):
+    df = pd.read_csv(ruta, dtype={columna: 'category' for columna in CATEGORICAS})
+    validar_tabla(df)
+    return compactar(df)
+
+
+def version_archivo(ruta=CSV):
+    # Hash corto del contenido, para invalidar lo calculado con otra versión de los datos
+    with open(ruta, 'rb') as f:
+        return hashlib.sha1(f.read()).hexdigest()[:12]
+
+
+def reporte_memoria(df):
+    # Bytes residentes por columna (incluye las cadenas de Python de las columnas object
+    # y las etiquetas de las categóricas), con su dtype y el total en la última fila
+    uso = df.memory_usage(index=False, deep=True)
+    reporte = pd.DataFrame({'dtype': df.dtypes.astype(str), 'bytes': uso})
+    reporte.loc['Total'] = ['', int(uso.sum())]
+    return reporte
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Compara la memoria del CSV leído tal cual contra la representación compacta")
+    parser.add_argument('--csv', default=CSV)
+    args = parser.parse_args()
+
+    original = reporte_memoria(pd.read_csv(args.csv))
+    compacto = reporte_memoria(leer_csv(args.csv))
+    reporte = original.join(compacto, lsuffix=' original', rsuffix=' compacto')
+    print(reporte.to_string())
+    print(f"\nReducción: {original.loc['Total', 'bytes'] / compacto.loc['Total', 'bytes']:.1f}x")
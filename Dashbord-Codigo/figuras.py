@@ -0,0 +1,177 @@
+import math
+
+import plotly.io as pio
+from plotly.colors import diverging, qualitative
+
+from metricas import medir_fase
+
+
+# Fábrica de figuras como diccionarios simples. Produce las mismas figuras que
+# px.bar y px.choropleth en app.py, pero sin validar ni reacomodar DataFrames en
+# cada llamada: la plantilla y el layout común se arman una sola vez al importar.
+
+FUENTE = {'family': 'Quattro Slab, serif'}
+ESCALA = [[i / (len(diverging.RdYlGn_r) - 1), color] for i, color in enumerate(diverging.RdYlGn_r)]
+COLORES = qualitative.Plotly
+MAPBOX = {'center': {'lat': 19.8301, 'lon': -90.5349}, 'style': 'carto-positron', 'zoom': 7}
+
+PLANTILLA = pio.templates[pio.templates.default].to_plotly_json()
+LAYOUT_BASE = {
+    'template': PLANTILLA,
+    'legend': {'tracegroupgap': 0},
+    'font': FUENTE,
+}
+
+
+def _geo(dominio_x=(0.0, 1.0), dominio_y=(0.0, 1.0)):
+    return {'domain': {'x': list(dominio_x), 'y': list(dominio_y)}, 'fitbounds': 'locations', 'visible': False}
+
+
+def _coloraxis(titulo):
+    return {'colorbar': {'title': {'text': titulo}}, 'colorscale': ESCALA}
+
+
+@medir_fase('figura')
+def figura_barras(municipios, totales, titulo):
+    # Barras horizontales por municipio coloreadas con la escala RdYlGn_r
+    return {
+        'data': [{
+            'type': 'bar',
+            'orientation': 'h',
+            'x': totales,
+            'y': municipios,
+            'marker': {'color': totales, 'coloraxis': 'coloraxis'},
+            'name': '',
+            'showlegend': False,
+            'textposition': 'auto',
+            'hovertemplate': 'Total de Delitos=%{marker.color}<br>Municipio=%{y}<extra></extra>',
+        }],
+        'layout': {
+            **LAYOUT_BASE,
+            'xaxis': {'title': {'text': 'Total de Delitos'}},
+            'yaxis': {'title': {'text': 'Municipio'}},
+            'coloraxis': _coloraxis('Total de Delitos'),
+            'title': {'text': titulo},
+            'barmode': 'relative',
+        },
+    }
+
+
+@medir_fase('figura')
+def figura_barras_por_year(years, municipios, totales, titulo):
+    # Barras agrupadas: una serie por año (municipios[i] y totales[i] son del año years[i])
+    return {
+        'data': [{
+            'type': 'bar',
+            'orientation': 'h',
+            'x': totales[i],
+            'y': municipios[i],
+            'marker': {'color': COLORES[i % len(COLORES)]},
+            'name': str(year),
+            'legendgroup': str(year),
+            'offsetgroup': str(year),
+            'showlegend': True,
+            'textposition': 'auto',
+            'hovertemplate': f'Año={year}<br>Total de Delitos=%{{x}}<br>Municipio=%{{y}}<extra></extra>',
+        } for i, year in enumerate(years)],
+        'layout': {
+            **LAYOUT_BASE,
+            'xaxis': {'title': {'text': 'Total de Delitos'}},
+            'yaxis': {'title': {'text': 'Municipio'}},
+            'legend': {'title': {'text': 'Año'}, 'tracegroupgap': 0},
+            'title': {'text': titulo},
+            'barmode': 'group',
+        },
+    }
+
+
+@medir_fase('figura')
+def figura_mapa(geojson, municipios, totales, titulo):
+    return {
+        'data': [{
+            'type': 'choropleth',
+            'geojson': geojson,
+            'featureidkey': 'properties.NOM_MUN',
+            'locations': municipios,
+            'z': totales,
+            'coloraxis': 'coloraxis',
+            'geo': 'geo',
+            'name': '',
+            'hovertemplate': 'Municipio=%{location}<br>Total de Delitos=%{z}<extra></extra>',
+        }],
+        'layout': {
+            **LAYOUT_BASE,
+            'geo': _geo(),
+            'coloraxis': _coloraxis('Total de Delitos'),
+            'title': {'text': titulo},
+            'mapbox': MAPBOX,
+        },
+    }
+
+
+@medir_fase('figura')
+def figura_mapas_por_year(geojson, years, municipios, totales, titulo, columnas=3):
+    # Un mapa pequeño por año en una cuadrícula, todos con el mismo eje de color
+    columnas = max(1, min(len(years), columnas))
+    filas = max(1, math.ceil(len(years) / columnas))
+    espacio_x, espacio_y = 0.02, 0.07
+    ancho = (1 - espacio_x * (columnas - 1)) / columnas
+    alto = (1 - espacio_y * (filas - 1)) / filas
+
+    datos = []
+    layout = {
+        **LAYOUT_BASE,
+        'coloraxis': _coloraxis('Total de Delitos'),
+        'title': {'text': titulo},
+        'mapbox': MAPBOX,
+        'annotations': [],
+    }
+    for i, year in enumerate(years):
+        fila, columna = divmod(i, columnas)
+        x0 = columna * (ancho + espacio_x)
+        y1 = 1 - fila * (alto + espacio_y)
+        geo = 'geo' if i == 0 else f'geo{i + 1}'
+        layout[geo] = _geo((x0, min(1.0, x0 + ancho)), (max(0.0, y1 - alto), y1))
+        layout['annotations'].append({
+            'text': str(year), 'showarrow': False, 'font': {},
+            'x': x0 + ancho / 2, 'xanchor': 'center', 'xref': 'paper',
+            'y': y1, 'yanchor': 'bottom', 'yref': 'paper',
+        })
+        datos.append({
+            'type': 'choropleth',
+            'geojson': geojson,
+            'featureidkey': 'properties.NOM_MUN',
+            'locations': municipios[i],
+            'z': totales[i],
+            'coloraxis': 'coloraxis',
+            'geo': geo,
+            'name': '',
+            'hovertemplate': f'Año={year}<br>Municipio=%{{location}}<br>Total de Delitos=%{{z}}<extra></extra>',
+        })
+    return {'data': datos, 'layout': layout}
+
+
+@medir_fase('figura')
+def figura_mapa_base(geojson, municipios, titulo):
+    # Todos los municipios en gris, sin escala de color
+    return {
+        'data': [{
+            'type': 'choropleth',
+            'geojson': geojson,
+            'featureidkey': 'properties.NOM_MUN',
+            'locations': list(municipios),
+            'z': [1] * len(municipios),
+            'colorscale': [[0.0, 'lightgray'], [1.0, 'lightgray']],
+            'showscale': False,
+            'showlegend': True,
+            'geo': 'geo',
+            'name': '',
+            'hovertemplate': 'locations=%{location}<extra></extra>',
+        }],
+        'layout': {
+            **LAYOUT_BASE,
+            'geo': _geo(),
+            'title': {'text': titulo},
+            'mapbox': MAPBOX,
+        },
+    }
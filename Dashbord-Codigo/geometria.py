@@ -0,0 +1,200 @@
+import argparse
+import hashlib
+import json
+import os
+from collections import defaultdict
+
+import numpy as np
+
+
+# Niveles de detalle: tolerancia de Douglas–Peucker (grados) y decimales de la rejilla
+NIVELES = {
+    'alto': {'tolerancia': 0.0005, 'decimales': 5},
+    'medio': {'tolerancia': 0.002, 'decimales': 4},
+    'bajo': {'tolerancia': 0.006, 'decimales': 3},
+}
+
+# Rejilla fina usada sólo para reconocer los vértices compartidos entre municipios
+DECIMALES_TOPOLOGIA = 7
+
+ENTRADA = 'GeoJSON/map-campeche.geojson'
+SALIDA = 'GeoJSON/simplificado'
+
+
+def ruta_nivel(nivel, directorio=SALIDA):
+    return os.path.join(directorio, f'map-campeche-{nivel}.geojson')
+
+
+def _poligonos(geometria):
+    if geometria['type'] == 'Polygon':
+        return [geometria['coordinates']]
+    return geometria['coordinates']
+
+
+def _cuantizar(anillo, decimales):
+    # Redondea a la rejilla y quita puntos repetidos; devuelve el anillo sin el punto de cierre
+    puntos = []
+    for x, y in anillo:
+        punto = (round(x, decimales), round(y, decimales))
+        if not puntos or puntos[-1] != punto:
+            puntos.append(punto)
+    if len(puntos) > 1 and puntos[0] == puntos[-1]:
+        puntos.pop()
+    return puntos
+
+
+def _uniones(anillos):
+    # Un vértice es unión cuando tiene más de dos vecinos distintos entre todos los anillos:
+    # ahí empieza o termina una frontera compartida entre municipios
+    vecinos = defaultdict(set)
+    for puntos in anillos:
+        n = len(puntos)
+        for i, punto in enumerate(puntos):
+            vecinos[punto].add(puntos[i - 1])
+            vecinos[punto].add(puntos[(i + 1) % n])
+    return {punto for punto, conjunto in vecinos.items() if len(conjunto) > 2}
+
+
+def _arcos(puntos, uniones):
+    # Parte un anillo en arcos entre uniones; cada arco incluye sus dos extremos
+    cortes = [i for i, punto in enumerate(puntos) if punto in uniones]
+    if not cortes:
+        # Anillo sin fronteras compartidas: se empieza en el punto menor para que
+        # un anillo idéntico en otro municipio produzca el mismo arco
+        inicio = puntos.index(min(puntos))
+        rotado = puntos[inicio:] + puntos[:inicio]
+        return [rotado + [rotado[0]]]
+    rotado = puntos[cortes[0]:] + puntos[:cortes[0]]
+    cortes = [i - cortes[0] for i in cortes] + [len(puntos)]
+    rotado.append(rotado[0])
+    return [rotado[a:b + 1] for a, b in zip(cortes, cortes[1:])]
+
+
+def _douglas_peucker(coordenadas, tolerancia):
+    conservar = np.zeros(len(coordenadas), dtype=bool)
+    conservar[0] = conservar[-1] = True
+    pendientes = [(0, len(coordenadas) - 1)]
+    while pendientes:
+        a, b = pendientes.pop()
+        if b - a < 2:
+            continue
+        tramo = coordenadas[a + 1:b]
+        inicio, fin = coordenadas[a], coordenadas[b]
+        direccion = fin - inicio
+        largo = np.hypot(*direccion)
+        if largo == 0:
+            distancias = np.hypot(*(tramo - inicio).T)
+        else:
+            distancias = np.abs(direccion[0] * (tramo[:, 1] - inicio[1]) - direccion[1] * (tramo[:, 0] - inicio[0])) / largo
+        mayor = int(np.argmax(distancias))
+        if distancias[mayor] > tolerancia:
+            medio = a + 1 + mayor
+            conservar[medio] = True
+            pendientes.append((a, medio))
+            pendientes.append((medio, b))
+    return conservar
+
+
+def _simplificar_arco(arco, tolerancia):
+    coordenadas = np.array(arco, dtype=float)
+    if arco[0] == arco[-1] and len(arco) > 3:
+        # Arco cerrado: se fija también el punto más lejano para no colapsar el anillo
+        lejano = int(np.argmax(np.hypot(*(coordenadas - coordenadas[0]).T)))
+        conservar = np.zeros(len(arco), dtype=bool)
+        conservar[:lejano + 1] |= _douglas_peucker(coordenadas[:lejano + 1], tolerancia)
+        conservar[lejano:] |= _douglas_peucker(coordenadas[lejano:], tolerancia)
+    else:
+        conservar = _douglas_peucker(coordenadas, tolerancia)
+    return [punto for punto, queda in zip(arco, conservar) if queda]
+
+
+def simplificar(geojson, tolerancia, decimales):
+    # Simplificación con topología: cada arco compartido se simplifica una sola vez y
+    # se reutiliza (invertido si hace falta) en los dos municipios que lo comparten,
+    # así las fronteras siguen coincidiendo sin huecos ni traslapes
+    anillos = [[_cuantizar(anillo, DECIMALES_TOPOLOGIA) for anillo in poligono]
+               for feature in geojson['features'] for poligono in _poligonos(feature['geometry'])]
+    uniones = _uniones([puntos for poligono in anillos for puntos in poligono if len(puntos) > 2])
+
+    simplificados = {}
+
+    def simplificar_anillo(puntos):
+        if len(puntos) < 3:
+            return None
+        resultado = []
+        for arco in _arcos(puntos, uniones):
+            clave = tuple(arco)
+            if clave not in simplificados:
+                inverso = clave[::-1]
+                if inverso in simplificados:
+                    simplificados[clave] = simplificados[inverso][::-1]
+                else:
+                    simplificados[clave] = _simplificar_arco(arco, tolerancia)
+            resultado.extend(simplificados[clave] if not resultado else simplificados[clave][1:])
+        # La cuantización final es por punto, así que los arcos compartidos siguen idénticos
+        resultado = _cuantizar(resultado, decimales)
+        if len(resultado) < 3:
+            return None
+        return [list(punto) for punto in resultado + resultado[:1]]
+
+    features = []
+    posicion = 0
+    for feature in geojson['features']:
+        poligonos = []
+        for _ in _poligonos(feature['geometry']):
+            poligono = [simplificar_anillo(puntos) for puntos in anillos[posicion]]
+            posicion += 1
+            if poligono[0] is None:
+                continue
+            poligonos.append([anillo for anillo in poligono if anillo is not None])
+        features.append({
+            'type': 'Feature',
+            'properties': feature['properties'],
+            'geometry': {'type': 'MultiPolygon', 'coordinates': poligonos},
+        })
+    return {'type': 'FeatureCollection', 'features': features}
+
+
+def serializar(geojson):
+    return json.dumps(geojson, ensure_ascii=False, separators=(',', ':'))
+
+
+def cargar_nivel(nivel, directorio=SALIDA):
+    with open(ruta_nivel(nivel, directorio), encoding='utf-8') as f:
+        return json.load(f)
+
+
+def leer_nivel(nivel, directorio=SALIDA):
+    # Contenido ya serializado, tal como se envía al navegador
+    with open(ruta_nivel(nivel, directorio), 'rb') as f:
+        return f.read()
+
+
+def url_nivel(nivel, contenido):
+    # La URL lleva el hash del contenido: si la geometría cambia cambia la URL,
+    # así el navegador puede guardarla en caché sin volver a pedirla
+    return f'/geo/map-campeche-{nivel}.{hashlib.sha1(contenido).hexdigest()[:12]}.geojson'
+
+
+def generar_niveles(entrada=ENTRADA, salida=SALIDA, niveles=NIVELES):
+    with open(entrada, encoding='utf-8') as f:
+        geojson = json.load(f)
+    os.makedirs(salida, exist_ok=True)
+    tamanos = {}
+    for nivel, parametros in niveles.items():
+        texto = serializar(simplificar(geojson, **parametros))
+        with open(ruta_nivel(nivel, salida), 'w', encoding='utf-8') as f:
+            f.write(texto)
+        tamanos[nivel] = len(texto.encode('utf-8'))
+    return tamanos
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Genera los niveles de detalle simplificados del mapa de Campeche")
+    parser.add_argument('--entrada', default=ENTRADA)
+    parser.add_argument('--salida', default=SALIDA)
+    args = parser.parse_args()
+
+    print(f"{args.entrada}: {os.path.getsize(args.entrada) / 1024:.0f} KB")
+    for nivel, tamano in generar_niveles(args.entrada, args.salida).items():
+        print(f"{ruta_nivel(nivel, args.salida)}: {tamano / 1024:.0f} KB")
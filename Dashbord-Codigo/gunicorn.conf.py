@@ -0,0 +1,26 @@
+import gc
+import multiprocessing
+import os
+
+
+# Configuración de gunicorn para el tablero (gunicorn -c gunicorn.conf.py wsgi:application).
+# Los valores se pueden cambiar con variables de entorno sin tocar este archivo.
+
+# Las rutas de los datos ('Data/...', 'GeoJSON/...') son relativas a este directorio
+chdir = os.path.dirname(os.path.abspath(__file__))
+bind = os.environ.get('DASHBOARD_BIND', '0.0.0.0:8050')
+workers = int(os.environ.get('DASHBOARD_WORKERS', multiprocessing.cpu_count()))
+threads = int(os.environ.get('DASHBOARD_THREADS', 4))
+timeout = int(os.environ.get('DASHBOARD_TIMEOUT', 30))
+accesslog = os.environ.get('DASHBOARD_ACCESSLOG', '-')
+
+# Los datos se cargan en el maestro y los workers los heredan al hacer fork: el paquete
+# abierto con mmap y los arreglos de NumPy del cubo se comparten página por página
+# mientras nadie los escriba, así que agregar workers no multiplica la memoria
+preload_app = True
+
+
+def when_ready(server):
+    # Mueve los objetos ya cargados a la generación permanente para que el recolector
+    # de basura de cada worker no los recorra (y no copie sus páginas al tocarlas)
+    gc.freeze()
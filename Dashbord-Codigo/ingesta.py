@@ -0,0 +1,125 @@
+import hashlib
+import io
+import os
+import sys
+import threading
+import time
+import traceback
+
+
+# Ingesta de novedades sin reiniciar: un directorio donde se dejan archivos CSV con las
+# columnas de datos-graficas.csv (Año, Municipio, la taxonomía) y sólo los meses que traen.
+# Cada archivo reemplaza esos meses de los años que contiene: un archivo con la columna
+# Marzo para 2024 es el mes de marzo completo de 2024, y uno con los doce meses es el año
+# completo. Volver a dejar un archivo corregido con el mismo nombre lo integra de nuevo.
+# Los archivos se integran en el orden en que se modificaron; al arrancar se integran todos,
+# así que el estado se reconstruye después de un reinicio sin tocar el CSV ni el paquete.
+# Para que no se lea un archivo a medio copiar, hay que copiarlo con otro nombre
+# (p. ej. .marzo.csv o marzo.csv.tmp) y renombrarlo al final.
+# El directorio se revisa cada `intervalo` segundos con os.scandir, sin dependencias.
+# Lo que se encuentra en una revisión se publica junto en una sola instantánea nueva
+# (tablero.DatosTablero). Si cambió el paquete o el CSV de config (p. ej. después de
+# python paquete.py), los datos se recargan aparte con todas las novedades y se publican al final.
+
+
+def leer_novedades(contenido):
+    # (tabla, meses que trae) de un archivo de novedades ya leído. Se importan aquí, como en
+    # tablero.DatosTablero._construir, para que importar la app no importe pandas
+    import pandas as pd
+
+    from cubo import MESES
+    from datos import CATEGORICAS, validar_tabla
+
+    df = pd.read_csv(io.BytesIO(contenido), dtype={columna: str for columna in CATEGORICAS})
+    meses = [mes for mes in MESES if mes in df.columns]
+    if not meses:
+        raise ValueError("no trae ninguna columna de mes")
+    validar_tabla(df, meses)
+    return df, meses
+
+
+class Ingesta:
+
+    def __init__(self, datos, directorio, intervalo=5):
+        self.datos = datos
+        self.directorio = directorio
+        self.intervalo = intervalo
+        # {nombre: (mtime_ns, tamaño)} de los archivos ya integrados
+        self._vistos = {}
+        self._fuentes = self._firma_fuentes()
+        self._candado = threading.Lock()
+        self._pid = None
+        self.integrados = 0
+
+    def pendientes(self):
+        # Archivos nuevos o modificados, del más antiguo al más reciente
+        if not os.path.isdir(self.directorio):
+            return []
+        pendientes = []
+        with os.scandir(self.directorio) as entradas:
+            for entrada in entradas:
+                if entrada.name.startswith('.') or not entrada.name.endswith('.csv') or not entrada.is_file():
+                    continue
+                estado = entrada.stat()
+                firma = (estado.st_mtime_ns, estado.st_size)
+                if self._vistos.get(entrada.name) != firma:
+                    pendientes.append((firma, entrada.name))
+        return [(nombre, firma) for firma, nombre in sorted(pendientes)]
+
+    def _firma_fuentes(self):
+        config = self.datos.config
+        return tuple(os.stat(ruta).st_mtime_ns if os.path.exists(ruta) else None
+                     for ruta in (config['paquete'], config['csv']))
+
+    def revisar(self):
+        # Integra los pendientes y devuelve cuántos se integraron. Un archivo con errores se
+        # reporta y no se vuelve a intentar hasta que cambie
+        import pandas as pd
+
+        with self._candado:
+            fuentes = self._firma_fuentes()
+            recargar = fuentes != self._fuentes
+            self._fuentes = fuentes
+            if recargar:
+                self._vistos.clear()
+
+            novedades = []
+            for nombre, firma in self.pendientes():
+                self._vistos[nombre] = firma
+                ruta = os.path.join(self.directorio, nombre)
+                try:
+                    with open(ruta, 'rb') as f:
+                        contenido = f.read()
+                    df, meses = leer_novedades(contenido)
+                except (OSError, ValueError, pd.errors.ParserError) as error:
+                    print(f"{ruta}: no se integró ({error})", file=sys.stderr)
+                    continue
+                novedades.append((df, meses, hashlib.sha1(contenido).hexdigest()))
+
+            if recargar:
+                self.datos.recargar(novedades)
+            elif novedades:
+                self.datos.integrar(novedades)
+            self.integrados += len(novedades)
+        return len(novedades)
+
+    def iniciar(self):
+        # Arranca el hilo que revisa el directorio, uno por proceso: con gunicorn los hilos no
+        # pasan el fork, así que se llama en cada petición (app.server.before_request) y sólo
+        # la primera de cada worker lo arranca
+        if self._pid == os.getpid():
+            return
+        with self._candado:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            threading.Thread(target=self._vigilar, name='ingesta', daemon=True).start()
+
+    def _vigilar(self):
+        while True:
+            try:
+                self.revisar()
+            except Exception:
+                # El hilo sigue vivo aunque falle una revisión
+                traceback.print_exc()
+            time.sleep(self.intervalo)
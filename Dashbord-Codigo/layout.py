@@ -0,0 +1,222 @@
+import dash_bootstrap_components as dbc
+from dash import dcc, html
+
+
+# Layouts del tablero. Las páginas que muestran años o listas de los datos son funciones
+# que reciben una instantánea de los datos (tablero.Instantanea), así importar este módulo no lee nada.
+
+custom_style = {
+    'font-family': 'Quattro Slab, serif',
+    'backgroundColor': '#F9F9F9',
+    'padding': '10px'
+}
+
+
+# Layout de la página
+navbar = dbc.Navbar(
+    dbc.Container(
+        [
+            dbc.Row(
+                [
+                    dbc.Col(
+                        html.Img(src='assets/LOGO_FGECAM.png', height="70px"),  
+                        width="auto"
+                    ),
+                    dbc.Col(
+                        dbc.Nav(
+                            [
+                                dbc.NavItem(dbc.NavLink("Inicio", href="/")),
+                                dbc.NavItem(dbc.NavLink("Estadísticas", href="/estadisticas")),
+                            ],
+                            navbar=True,
+                            className="ms-auto"  
+                        ),
+                        width="auto"
+                    ),
+                ],
+                align="center",
+                className="g-0"
+            )
+        ],
+        fluid=True
+    ),
+    color="#10312B",
+    dark=True,
+)
+
+# Define el pie de página
+footer = html.Div(
+    dbc.Row(
+        [
+            dbc.Col(
+                html.Img(src='assets/JAGUAR.png', height="70px"),  
+                width={"size": 2, "offset": 0},  
+                className="text-center"  
+            ),
+            dbc.Col(
+                [
+                    dbc.Nav(
+                        [
+                            dbc.NavItem(dbc.NavLink(html.I(className="fab fa-facebook"), href="https://www.facebook.com/GobiernoDeCampeche/?locale=es_LA", external_link=True)),
+                            dbc.NavItem(dbc.NavLink(html.I(className="fab fa-twitter"), href="https://x.com/ucscampeche?lang=es", external_link=True)),
+                            dbc.NavItem(dbc.NavLink(html.I(className="fab fa-instagram"), href="https://www.instagram.com/gobiernodecampeche/", external_link=True)),
+                            dbc.NavItem(dbc.NavLink(html.I(className="fab fa-tiktok"), href="https://www.tiktok.com/@gobiernodetodos", external_link=True)),
+                        ],
+                        navbar=True,
+                        className="text-start"  
+                    )
+                ],
+                width={"size": 2, "offset": 0}  
+            )
+        ],
+        justify="between",  
+        className="py-2"  
+    ),
+    style={
+        "backgroundColor": "#AB9470",  
+        "color": "white",               
+        "width": "100%",                
+        "position": "relative",          
+        "bottom": "0",                  
+        "padding": "0"                 
+    },
+)
+
+def inicio_layout(datos):
+    return dbc.Container([
+        dbc.Row([
+            dbc.Col([
+                html.H1("Fiscalía General del Estado de Campeche", style={
+                    'color': '#53565A',
+                    'font-size': '36px',
+                    'font-weight': 'bold',
+                    'margin-top': '20px',
+                    'text-align': 'center',
+                    'font-family': 'Quattro Slab, serif'
+                })
+            ])
+        ]),
+        dbc.Row([
+            dbc.Col([
+                html.H3("Mapa de los Municipios de Campeche", style={'text-align': 'center', 'font-family': 'Quattro Slab, serif'}),
+                dcc.Graph(id="mapa-campeche", figure={}, config={"displayModeBar": False}),
+            ], width=8),
+            dbc.Col([
+                html.H3("Seleccione un año y un tipo de delito para ver las estadísticas", style={'text-align': 'center', 'font-family': 'Quattro Slab, serif'}),
+                dcc.Dropdown(
+                    id="year-dropdown",
+                    options=[{"label": str(year), "value": year} for year in datos.years],
+                    placeholder="Seleccione un año",
+                    style={"width": "100%", 'font-family': 'Quattro Slab, serif'}
+                ),
+                dcc.Dropdown(
+                    id="delito-dropdown",
+                    options=[{'label': delito, 'value': delito} for delito in datos.taxonomia.tipos()],
+                    placeholder="Seleccione un delito",
+                    style={"margin-top": "20px", "width": "100%", 'font-family': 'Quattro Slab, serif'}
+                ),
+                dcc.Graph(id="grafica-estadisticas", style={'margin-top': '20px', 'display': 'none'}),
+                html.Button("Otra Selección", id="otra-seleccion-btn", style={
+                    'margin-top': '20px',
+                    'background-color': '#9F2241',
+                    'color': 'white',
+                    'border-radius': '15px',
+                    'border': 'none',
+                    'padding': '10px 15px',
+                    'font-family': 'Quattro Slab, serif'
+                }),
+                dcc.Dropdown(
+                    id="year-dropdown-otra",
+                    options=[{"label": str(year), "value": year} for year in datos.years],
+                    multi=True,
+                    placeholder="Seleccione otros años",
+                    style={"margin-top": "20px", "display": 'none', "width": "100%", 'font-family': 'Quattro Slab, serif'}
+                ),
+            ], width=4),
+        ]),
+        dbc.Row([
+            dbc.Col(dcc.Graph(id="mapa-campeche-otra", figure={}, style={'margin-top': '20px', 'display': 'none', 'height': '400px', 'font-family': 'Quattro Slab, serif'}), width=8),
+            dbc.Col(dcc.Graph(id="grafica-estadisticas-otra", style={'margin-top': '20px', 'display': 'none', 'height': '400px', 'font-family': 'Quattro Slab, serif'}), width=4),
+        ], style={'height': '450px'}),
+        # Qué figuras tiene ya el navegador, para mandar sólo parches cuando cambian los datos
+        dcc.Store(id="inicio-figuras"),
+        dcc.Store(id="inicio-figuras-otra"),
+    ], fluid=True)
+
+def estadisticas_layout(datos):
+    return dbc.Container([
+        dbc.Row([
+            dbc.Col([dcc.Dropdown(id="bien-juridico-dropdown",
+                                   options=[{"label": bien, "value": bien} for bien in datos.taxonomia.bienes()],
+                                   placeholder="Seleccione Bien Jurídico",
+                                   clearable=False,
+                                   style={"width": "100%", "margin-bottom": "15px"})], width=4),
+            dbc.Col([dcc.Dropdown(id="municipio-dropdown",
+                                   options=[{"label": municipio.capitalize(), "value": municipio} for municipio in datos.municipios],
+                                   placeholder="Seleccione Municipio",
+                                   clearable=False,
+                                   style={"width": "100%", "margin-bottom": "15px"})], width=4),
+            dbc.Col([dcc.Dropdown(id="year-dropdown-estadisticas",
+                                   options=[{"label": str(year), "value": year} for year in datos.years],
+                                   placeholder="Seleccione Año",
+                                   clearable=False,
+                                   style={"width": "100%", "margin-bottom": "15px"})], width=4),
+        ], justify="center", style={"padding-top": "20px"}),
+    
+        dbc.Row([
+            dbc.Col([dcc.Dropdown(id="delitos-dropdown",
+                                   placeholder="Seleccione Tipo de Delito",
+                                   clearable=False,
+                                   style={"width": "100%", "margin-bottom": "15px"})], width=6),
+            dbc.Col([dcc.Dropdown(id="subdelitos-dropdown",
+                                   placeholder="Seleccione Subtipo de Delito",
+                                   clearable=False,
+                                   style={"width": "100%", "margin-bottom": "15px"})], width=6),
+        ], justify="center"),
+    
+        dbc.Row([
+            dbc.Col(id="modalidades-container", style={"margin-top": "20px"})  # Contenedor para los botones
+        ]),
+    
+        dbc.Row([
+            dbc.Col([dcc.Graph(id="estadisticas-grafica", style={'margin-top': '20px'})])
+        ]),
+    
+        dbc.Row([
+            dbc.Col([html.Button("Otra Selección", id="otra-seleccion-btn", style={
+                'margin-top': '20px',
+                'background-color': '#9F2241',
+                'color': 'white',
+                'border-radius': '15px',
+                'border': 'none',
+                'padding': '10px 15px',
+                'font-family': 'Quattro Slab, serif'
+            })], width=12)
+        ]),
+    
+        dbc.Row([
+            dbc.Col([dcc.Dropdown(id="estadisticas-year-dropdown-otra",
+                                   options=[],
+                                   multi=True,
+                                   placeholder="Seleccione otros años",
+                                   clearable=False,
+                                   style={"width": "100%", "margin-top": "15px", "display": "none"})
+            ])
+        ]),
+    
+        dbc.Row([
+            dbc.Col([dcc.Graph(id="estadisticas-grafica-otra", style={'margin-top': '20px', 'display': 'none'})])
+        ])
+    ], style=custom_style)
+
+
+# Layout principal de la aplicación
+def layout_principal(datos):
+    return html.Div([
+        dcc.Location(id="url"),
+        # Lista de años que usan los callbacks del navegador; se envía una sola vez con la página
+        dcc.Store(id="years-store", data=[int(year) for year in datos.years]),
+        navbar,
+        html.Div(id="page-content"),
+        footer 
+    ])
@@ -0,0 +1,336 @@
+import bisect
+import contextvars
+import functools
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime
+
+import flask
+from dash.exceptions import PreventUpdate
+
+
+# Métricas por callback en el formato de texto de Prometheus (ruta /metrics).
+# Cada llamada se divide en fases:
+#   filtrar     selección de índices y recorte del cubo (cubo.sumar)
+#   agregar     sumas sobre el bloque recortado (cubo.sumar)
+#   figura      armado de las figuras (figuras.py)
+#   serializar  de que termina la función del callback a que Dash tiene el JSON de la respuesta
+#   total       la llamada completa
+# El código marca sus fases con `with fase('...')`; si las métricas están apagadas no hay
+# medición activa y fase() devuelve un contexto vacío, así que el costo es una consulta
+# a una ContextVar. Con gunicorn cada worker lleva sus propias métricas.
+# Las mismas fases pueden ir en el encabezado Server-Timing de cada respuesta (las muestran
+# las herramientas de desarrollo del navegador) y en una traza JSON lines con las entradas
+# de cada llamada, para reproducir después las consultas lentas (bench/reproducir.py).
+
+LIMITES_SEGUNDOS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+LIMITES_BYTES = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+_medicion = contextvars.ContextVar('medicion', default=None)
+
+
+class Medicion:
+    # Tiempos de una llamada a un callback
+    __slots__ = ('callback', 'fases', 'fin_funcion')
+
+    def __init__(self, callback):
+        self.callback = callback
+        self.fases = defaultdict(float)
+        self.fin_funcion = None
+
+
+class _Fase:
+    __slots__ = ('medicion', 'nombre', 'inicio')
+
+    def __init__(self, medicion, nombre):
+        self.medicion = medicion
+        self.nombre = nombre
+
+    def __enter__(self):
+        self.inicio = time.perf_counter()
+
+    def __exit__(self, *error):
+        self.medicion.fases[self.nombre] += time.perf_counter() - self.inicio
+
+
+class _SinMedicion:
+    def __enter__(self):
+        pass
+
+    def __exit__(self, *error):
+        pass
+
+
+_SIN_MEDICION = _SinMedicion()
+
+
+def fase(nombre):
+    medicion = _medicion.get()
+    if medicion is None:
+        return _SIN_MEDICION
+    return _Fase(medicion, nombre)
+
+
+def medir_fase(nombre):
+    # Decorador: toda la función cuenta como la fase `nombre`
+    def decorador(funcion):
+        @functools.wraps(funcion)
+        def envoltura(*args, **kwargs):
+            with fase(nombre):
+                return funcion(*args, **kwargs)
+        return envoltura
+    return decorador
+
+
+class Histograma:
+    __slots__ = ('limites', 'cubetas', 'suma', 'cuenta')
+
+    def __init__(self, limites):
+        self.limites = limites
+        self.cubetas = [0] * (len(limites) + 1)
+        self.suma = 0.0
+        self.cuenta = 0
+
+    def observar(self, valor):
+        self.cubetas[bisect.bisect_left(self.limites, valor)] += 1
+        self.suma += valor
+        self.cuenta += 1
+
+
+def _escapar(valor):
+    return str(valor).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _etiquetas(**etiquetas):
+    return '{' + ','.join(f'{nombre}="{_escapar(valor)}"' for nombre, valor in etiquetas.items()) + '}'
+
+
+def _clave(entrada):
+    # 'id.propiedad'; los id de los componentes con patrón son diccionarios
+    identificador = entrada['id']
+    if isinstance(identificador, dict):
+        identificador = json.dumps(identificador, sort_keys=True, separators=(',', ':'))
+    return f"{identificador}.{entrada['property']}"
+
+
+def _valores(entradas):
+    # Entradas y estado de la petición de Dash como {'id.propiedad': valor}; con ALL cada
+    # elemento es a su vez una lista de entradas
+    valores = {}
+    for entrada in entradas or ():
+        for elemento in entrada if isinstance(entrada, list) else (entrada,):
+            valores[_clave(elemento)] = elemento.get('value')
+    return valores
+
+
+def encabezado_server_timing(medicion):
+    # p. ej. 'filtrar;dur=0.412, agregar;dur=0.020, figura;dur=0.051, serializar;dur=3.100, total;dur=4.012'
+    return ', '.join(f'{nombre};dur={segundos * 1000:.3f}' for nombre, segundos in medicion.fases.items())
+
+
+class Traza:
+    # Una línea JSON por llamada a un callback. Cada línea se escribe con una sola llamada a
+    # os.write sobre un archivo abierto con O_APPEND, así que varios workers pueden compartirlo.
+    # El archivo se abre en la primera escritura, ya dentro del worker
+
+    def __init__(self, ruta, minimo_ms=0):
+        self.ruta = ruta
+        self.minimo_ms = minimo_ms
+        self._descriptor = None
+
+    def escribir(self, medicion, tamano, error, peticion):
+        total_ms = medicion.fases.get('total', 0.0) * 1000
+        if total_ms < self.minimo_ms:
+            return
+        registro = {
+            'fecha': datetime.now().isoformat(timespec='milliseconds'),
+            'callback': medicion.callback,
+            'ms': {nombre: round(segundos * 1000, 3) for nombre, segundos in medicion.fases.items()},
+            'bytes': tamano,
+            'error': error,
+            'disparador': peticion.get('changedPropIds'),
+            'entradas': _valores(peticion.get('inputs')),
+            'estado': _valores(peticion.get('state')),
+            # La petición completa, para volver a enviarla tal cual
+            'peticion': peticion,
+        }
+        linea = (json.dumps(registro, ensure_ascii=False, separators=(',', ':'), default=str) + '\n').encode('utf-8')
+        if self._descriptor is None:
+            self._descriptor = os.open(self.ruta, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        os.write(self._descriptor, linea)
+
+
+class Metricas:
+
+    def __init__(self, server_timing=False, traza=None):
+        self._candado = threading.Lock()
+        self.llamadas = defaultdict(int)
+        self.errores = defaultdict(int)
+        self.duraciones = {}
+        self.tamanos = {}
+        self._fuentes = []
+        # Encabezado Server-Timing en las respuestas de los callbacks y traza opcional (una Traza)
+        self.server_timing = server_timing
+        self.traza = traza
+
+    def observar(self, medicion, tamano=None, error=False):
+        with self._candado:
+            self.llamadas[medicion.callback] += 1
+            if error:
+                self.errores[medicion.callback] += 1
+            for nombre, segundos in medicion.fases.items():
+                clave = (medicion.callback, nombre)
+                if clave not in self.duraciones:
+                    self.duraciones[clave] = Histograma(LIMITES_SEGUNDOS)
+                self.duraciones[clave].observar(segundos)
+            if tamano is not None:
+                if medicion.callback not in self.tamanos:
+                    self.tamanos[medicion.callback] = Histograma(LIMITES_BYTES)
+                self.tamanos[medicion.callback].observar(tamano)
+
+    def callback(self, app):
+        # Reemplazo de app.callback que marca cuándo termina la función del callback
+        # (lo que sigue hasta la respuesta es serialización de Dash)
+        def registrar(*args, **kwargs):
+            def decorador(funcion):
+                @functools.wraps(funcion)
+                def envoltura(*args_funcion, **kwargs_funcion):
+                    try:
+                        return funcion(*args_funcion, **kwargs_funcion)
+                    finally:
+                        medicion = _medicion.get()
+                        if medicion is not None:
+                            medicion.fin_funcion = time.perf_counter()
+                return app.callback(*args, **kwargs)(envoltura)
+            return decorador
+        return registrar
+
+    def instrumentar(self, app):
+        # Envuelve cada callback de servidor ya registrado: abre una medición, toma el tiempo
+        # total y el tamaño del JSON que Dash devuelve, y la registra al terminar
+        for registro in app.callback_map.values():
+            if 'callback' in registro:
+                registro['callback'] = self._envolver(registro['callback'])
+        if self.server_timing or self.traza is not None:
+            app.server.after_request(self._despues_de_peticion)
+
+    def _envolver(self, llamada):
+        funcion = llamada
+        while hasattr(funcion, '__wrapped__'):
+            funcion = funcion.__wrapped__
+        nombre = funcion.__name__
+
+        @functools.wraps(llamada)
+        def envoltura(*args, **kwargs):
+            medicion = Medicion(nombre)
+            token = _medicion.set(medicion)
+            inicio = time.perf_counter()
+            respuesta = None
+            error = False
+            try:
+                respuesta = llamada(*args, **kwargs)
+                return respuesta
+            except PreventUpdate:
+                raise
+            except Exception:
+                error = True
+                raise
+            finally:
+                fin = time.perf_counter()
+                _medicion.reset(token)
+                if medicion.fin_funcion is not None:
+                    medicion.fases['serializar'] = fin - medicion.fin_funcion
+                medicion.fases['total'] = fin - inicio
+                tamano = len(respuesta) if isinstance(respuesta, (str, bytes)) else None
+                self.observar(medicion, tamano, error)
+                if flask.has_request_context():
+                    flask.g.medicion = (medicion, tamano, error)
+        return envoltura
+
+    def _despues_de_peticion(self, respuesta):
+        # Sólo las peticiones que pasaron por un callback instrumentado dejan su medición en g
+        medido = flask.g.pop('medicion', None)
+        if medido is None:
+            return respuesta
+        medicion, tamano, error = medido
+        if self.server_timing:
+            respuesta.headers['Server-Timing'] = encabezado_server_timing(medicion)
+        if self.traza is not None:
+            self.traza.escribir(medicion, tamano, error, flask.request.get_json(silent=True) or {})
+        return respuesta
+
+    def agregar_fuente(self, fuente):
+        # fuente() devuelve líneas ya en formato de exposición (p. ej. las estadísticas de la caché)
+        self._fuentes.append(fuente)
+
+    def exposicion(self):
+        lineas = []
+        with self._candado:
+            lineas += ['# HELP dashboard_callback_llamadas_total Llamadas a cada callback',
+                       '# TYPE dashboard_callback_llamadas_total counter']
+            lineas += [f'dashboard_callback_llamadas_total{_etiquetas(callback=c)} {n}' for c, n in sorted(self.llamadas.items())]
+            lineas += ['# HELP dashboard_callback_errores_total Llamadas que terminaron en una excepción',
+                       '# TYPE dashboard_callback_errores_total counter']
+            lineas += [f'dashboard_callback_errores_total{_etiquetas(callback=c)} {self.errores[c]}' for c in sorted(self.llamadas)]
+            lineas += ['# HELP dashboard_callback_duracion_segundos Duración de cada fase de los callbacks',
+                       '# TYPE dashboard_callback_duracion_segundos histogram']
+            for (callback, nombre), histograma in sorted(self.duraciones.items()):
+                lineas += self._histograma('dashboard_callback_duracion_segundos', histograma, callback=callback, fase=nombre)
+            lineas += ['# HELP dashboard_callback_respuesta_bytes Tamaño del JSON de respuesta de cada callback',
+                       '# TYPE dashboard_callback_respuesta_bytes histogram']
+            for callback, histograma in sorted(self.tamanos.items()):
+                lineas += self._histograma('dashboard_callback_respuesta_bytes', histograma, callback=callback)
+        for fuente in self._fuentes:
+            lineas += fuente()
+        return '\n'.join(lineas) + '\n'
+
+    @staticmethod
+    def _histograma(nombre, histograma, **etiquetas):
+        lineas = []
+        acumulado = 0
+        for limite, cuenta in zip(histograma.limites + ('+Inf',), histograma.cubetas):
+            acumulado += cuenta
+            lineas.append(f'{nombre}_bucket{_etiquetas(**etiquetas, le=limite)} {acumulado}')
+        lineas.append(f'{nombre}_sum{_etiquetas(**etiquetas)} {histograma.suma}')
+        lineas.append(f'{nombre}_count{_etiquetas(**etiquetas)} {histograma.cuenta}')
+        return lineas
+
+    def registrar_ruta(self, app, ruta='/metrics'):
+        @app.server.route(ruta)
+        def metricas():
+            return flask.Response(self.exposicion(), mimetype='text/plain; version=0.0.4; charset=utf-8')
+
+
+def metricas_cache(cache):
+    # Estadísticas de una CacheFiguras en formato de exposición
+    def fuente():
+        estadisticas = cache.estadisticas()
+        lineas = [
+            '# TYPE dashboard_cache_figuras_aciertos_total counter',
+            f"dashboard_cache_figuras_aciertos_total {estadisticas['aciertos']}",
+            '# TYPE dashboard_cache_figuras_aciertos_compartida_total counter',
+            f"dashboard_cache_figuras_aciertos_compartida_total {estadisticas['aciertos_compartida']}",
+            '# TYPE dashboard_cache_figuras_fallos_total counter',
+            f"dashboard_cache_figuras_fallos_total {estadisticas['fallos']}",
+            '# TYPE dashboard_cache_figuras_desalojos_total counter',
+            f"dashboard_cache_figuras_desalojos_total {estadisticas['desalojos']}",
+            '# TYPE dashboard_cache_figuras_entradas gauge',
+            f"dashboard_cache_figuras_entradas {estadisticas['entradas']}",
+            '# TYPE dashboard_cache_figuras_bytes gauge',
+            f"dashboard_cache_figuras_bytes {estadisticas['bytes']}",
+        ]
+        if cache.compartida is not None:
+            compartida = cache.compartida.estadisticas()
+            lineas += [
+                '# TYPE dashboard_cache_compartida_entradas gauge',
+                f"dashboard_cache_compartida_entradas {compartida['entradas']}",
+                '# TYPE dashboard_cache_compartida_bytes gauge',
+                f"dashboard_cache_compartida_bytes {compartida['bytes']}",
+                '# TYPE dashboard_cache_compartida_errores_total counter',
+                f"dashboard_cache_compartida_errores_total {compartida['errores']}",
+            ]
+        return lineas
+    return fuente
@@ -0,0 +1,178 @@
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+
+import numpy as np
+import pandas as pd
+
+from datos import CATEGORICAS, COLUMNAS, CSV, entero_mas_angosto, leer_csv
+from geometria import ENTRADA, NIVELES, serializar, simplificar, url_nivel
+
+
+# Formato del paquete:
+#   FIRMA | longitud de la cabecera (uint64) | cabecera JSON | arreglos alineados a 64 bytes
+# La cabecera describe cada columna (dtype, posición y categorías) y cada nivel de la
+# geometría, que se guarda ya serializado tal como se envía al navegador.
+FIRMA = b'FGECAM\x00\x01'
+VERSION_FORMATO = 1
+ALINEACION = 64
+
+SALIDA = 'Data/datos.paquete'
+
+
+def validar_geojson(geojson, municipios=()):
+    if geojson.get('type') != 'FeatureCollection':
+        raise ValueError("El GeoJSON debe ser un FeatureCollection")
+    nombres = set()
+    for feature in geojson['features']:
+        if feature.get('geometry', {}).get('type') not in ('Polygon', 'MultiPolygon'):
+            raise ValueError("Cada municipio debe tener geometría Polygon o MultiPolygon")
+        if 'NOM_MUN' not in feature.get('properties', {}):
+            raise ValueError("Cada municipio debe tener la propiedad NOM_MUN")
+        nombres.add(feature['properties']['NOM_MUN'])
+    # Devuelve los municipios del CSV que no tienen geometría (no se pueden dibujar en el mapa)
+    return sorted(set(municipios) - nombres)
+
+
+def _alinear(posicion):
+    return (posicion + ALINEACION - 1) // ALINEACION * ALINEACION
+
+
+def escribir_paquete(df, geometrias, ruta=SALIDA):
+    # geometrias: {nivel: bytes del GeoJSON serializado}
+    bloques = []
+    columnas = []
+    for columna in COLUMNAS:
+        if columna in CATEGORICAS:
+            categorias = pd.Categorical(df[columna])
+            arreglo = np.ascontiguousarray(categorias.codes)
+            columnas.append({'nombre': columna, 'tipo': 'categoria', 'categorias': categorias.categories.tolist()})
+        else:
+            arreglo = np.ascontiguousarray(entero_mas_angosto(df[columna]))
+            columnas.append({'nombre': columna, 'tipo': 'entero'})
+        columnas[-1]['dtype'] = arreglo.dtype.str
+        bloques.append(arreglo.tobytes())
+
+    niveles = {}
+    for nivel, contenido in geometrias.items():
+        niveles[nivel] = {'url': url_nivel(nivel, contenido)}
+        bloques.append(contenido)
+
+    # La versión de datos cambia si cambia cualquier columna o la geometría
+    version = hashlib.sha1()
+    for bloque in bloques:
+        version.update(bloque)
+
+    # Las posiciones dependen del tamaño de la cabecera, que a su vez las contiene:
+    # se reserva espacio y se repite hasta que la cabecera deja de crecer
+    reservado = 0
+    while True:
+        posicion = _alinear(len(FIRMA) + 8 + reservado)
+        for descriptor, bloque in zip(columnas + list(niveles.values()), bloques):
+            descriptor['desplazamiento'] = posicion
+            descriptor['longitud'] = len(bloque)
+            posicion = _alinear(posicion + len(bloque))
+        cabecera = json.dumps({
+            'version_formato': VERSION_FORMATO,
+            'version_datos': version.hexdigest()[:12],
+            'filas': len(df),
+            'columnas': columnas,
+            'geometria': niveles,
+        }, ensure_ascii=False).encode('utf-8')
+        if len(cabecera) <= reservado:
+            break
+        reservado = _alinear(len(cabecera))
+
+    # Se escribe a un archivo temporal y se renombra para que nunca se lea un paquete a medias
+    temporal = ruta + '.tmp'
+    with open(temporal, 'wb') as f:
+        f.write(FIRMA)
+        f.write(struct.pack('<Q', reservado))
+        f.write(cabecera.ljust(reservado, b' '))
+        for descriptor, bloque in zip(columnas + list(niveles.values()), bloques):
+            f.write(b'\x00' * (descriptor['desplazamiento'] - f.tell()))
+            f.write(bloque)
+    os.replace(temporal, ruta)
+    return version.hexdigest()[:12]
+
+
+class Paquete:
+    # Paquete abierto con mmap: las columnas son vistas de sólo lectura sobre el archivo,
+    # así que abrirlo no lee los datos y los procesos que lo abren comparten las páginas
+
+    def __init__(self, ruta=SALIDA):
+        with open(ruta, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mmap[:len(FIRMA)] != FIRMA:
+            raise ValueError(f"{ruta} no es un paquete de datos")
+        (longitud,) = struct.unpack_from('<Q', self._mmap, len(FIRMA))
+        inicio = len(FIRMA) + 8
+        cabecera = json.loads(bytes(self._mmap[inicio:inicio + longitud]))
+        if cabecera['version_formato'] != VERSION_FORMATO:
+            raise ValueError(f"{ruta} tiene la versión de formato {cabecera['version_formato']}, se esperaba {VERSION_FORMATO}")
+        self.ruta = ruta
+        self.version = cabecera['version_datos']
+        self.filas = cabecera['filas']
+        self._columnas = cabecera['columnas']
+        self._geometria = cabecera['geometria']
+
+    def _arreglo(self, descriptor):
+        dtype = np.dtype(descriptor['dtype'])
+        return np.frombuffer(self._mmap, dtype=dtype, count=descriptor['longitud'] // dtype.itemsize,
+                             offset=descriptor['desplazamiento'])
+
+    def tabla(self):
+        datos = {}
+        for descriptor in self._columnas:
+            arreglo = self._arreglo(descriptor)
+            if descriptor['tipo'] == 'categoria':
+                arreglo = pd.Categorical.from_codes(arreglo, descriptor['categorias'])
+            datos[descriptor['nombre']] = arreglo
+        return pd.DataFrame(datos, copy=False)
+
+    def geometrias(self):
+        # {url versionada: contenido} de cada nivel de detalle
+        return {descriptor['url']: self._mmap[descriptor['desplazamiento']:descriptor['desplazamiento'] + descriptor['longitud']]
+                for descriptor in self._geometria.values()}
+
+    def url_geometria(self, nivel):
+        return self._geometria[nivel]['url']
+
+
+def abrir_paquete(ruta=SALIDA, fuentes=(CSV, ENTRADA)):
+    # Devuelve None si no hay paquete o si alguna fuente es más reciente que él
+    if not os.path.exists(ruta):
+        return None
+    if any(os.path.getmtime(fuente) > os.path.getmtime(ruta) for fuente in fuentes if os.path.exists(fuente)):
+        print(f"{ruta} es más antiguo que los datos; se usará el CSV (ejecute python paquete.py)", file=sys.stderr)
+        return None
+    return Paquete(ruta)
+
+
+def compilar(csv=CSV, salida=SALIDA, geojson=ENTRADA):
+    df = leer_csv(csv)
+    with open(geojson, encoding='utf-8') as f:
+        mapa = json.load(f)
+    sin_geometria = validar_geojson(mapa, df['Municipio'].unique())
+    geometrias = {nivel: serializar(simplificar(mapa, **parametros)).encode('utf-8') for nivel, parametros in NIVELES.items()}
+    return escribir_paquete(df, geometrias, salida), sin_geometria
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Valida el CSV y el GeoJSON y genera el paquete binario de datos")
+    parser.add_argument('--csv', default=CSV)
+    parser.add_argument('--geojson', default=ENTRADA)
+    parser.add_argument('--salida', default=SALIDA)
+    args = parser.parse_args()
+
+    try:
+        version, sin_geometria = compilar(args.csv, args.salida, args.geojson)
+    except ValueError as error:
+        sys.exit(f"Error de validación: {error}")
+    for municipio in sin_geometria:
+        print(f"Aviso: {municipio} no tiene geometría en el mapa", file=sys.stderr)
+    print(f"{args.salida}: versión {version}, {os.path.getsize(args.salida) / 1024:.0f} KB")
@@ -0,0 +1,113 @@
+import json
+
+import dash._callback
+import dash._utils
+import dash.dash
+import numpy as np
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# Serialización a JSON de las respuestas de Dash (callbacks, layout, dependencias).
+# Dash pasa todo por plotly.io.json.to_json_plotly: con orjson instalado intenta primero
+# orjson.dumps y, si encuentra algo que orjson no conoce (un Patch, un componente, un arreglo
+# de NumPy de texto como los nombres de los municipios del cubo), copia la respuesta completa
+# con clean_to_json_compatible y la serializa otra vez. Casi todas las respuestas del tablero
+# caen en ese segundo camino.
+# serializar_orjson hace una sola pasada con el `default` de orjson: los arreglos numéricos de
+# NumPy se escriben directamente desde su memoria y sólo lo que orjson no conoce pasa por
+# Python. El texto resultante es igual byte a byte al de Plotly.
+# Serializado envuelve un JSON que ya se serializó (las figuras de cache.CacheFiguras): con
+# serializar_orjson se copia tal cual dentro de la respuesta, sin decodificarlo y volver a
+# codificarlo; el serializador de Plotly lo decodifica.
+
+# Mismos reemplazos que hace Plotly para poder incrustar el JSON en HTML
+_REEMPLAZOS = (('<', '\\u003c'), ('>', '\\u003e'), ('/', '\\u002f'), (' ', '\\u2028'), (' ', '\\u2029'))
+# Módulos de Dash que importaron to_json por nombre
+_MODULOS = (dash._callback, dash.dash)
+# Texto que ocupa el lugar de cada Serializado mientras orjson serializa el resto
+_MARCA = '\x00serializado:'
+
+
+class Serializado:
+    __slots__ = ('texto',)
+
+    def __init__(self, texto):
+        self.texto = texto
+
+    def to_plotly_json(self):
+        return json.loads(self.texto)
+
+
+def _convertir(valor):
+    # orjson llama a esta función sólo con los valores que no sabe serializar
+    if isinstance(valor, np.ndarray):
+        if valor.dtype.kind in 'biuf':
+            # No contiguo: orjson sólo escribe arreglos contiguos
+            return np.ascontiguousarray(valor)
+        if valor.dtype.kind == 'M':
+            return np.datetime_as_string(valor).tolist()
+        return valor.tolist()
+    if hasattr(valor, 'to_plotly_json'):
+        # Componentes de Dash, Patch y figuras de Plotly
+        return valor.to_plotly_json()
+    if hasattr(valor, 'to_numpy'):
+        # Series e índices de pandas
+        return valor.to_numpy()
+    if isinstance(valor, np.generic):
+        return valor.item()
+    raise TypeError(f"{type(valor).__name__} no se puede serializar a JSON")
+
+
+def serializar_orjson(valor):
+    fragmentos = []
+
+    def convertir(valor):
+        if isinstance(valor, Serializado):
+            fragmentos.append(valor.texto)
+            return f'{_MARCA}{len(fragmentos) - 1}'
+        return _convertir(valor)
+
+    texto = orjson.dumps(valor, default=convertir,
+                         option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY).decode('utf-8')
+    for caracter, reemplazo in _REEMPLAZOS:
+        if caracter in texto:
+            texto = texto.replace(caracter, reemplazo)
+    # Los fragmentos ya traen los reemplazos y aparecen en el mismo orden en que se encontraron
+    for i, fragmento in enumerate(fragmentos):
+        texto = texto.replace(json.dumps(f'{_MARCA}{i}'), fragmento, 1)
+    return texto
+
+
+SERIALIZADORES = {
+    # El de Dash sin cambios (plotly.io.json con el motor de plotly.io.json.config)
+    'plotly': dash._utils.to_json,
+}
+if orjson is not None:
+    SERIALIZADORES['orjson'] = serializar_orjson
+
+
+def serializador_por_omision():
+    return 'orjson' if orjson is not None else 'plotly'
+
+
+# El que se eligió con usar_serializador
+_actual = SERIALIZADORES['plotly']
+
+
+def serializar(valor):
+    # Con el serializador de las respuestas (p. ej. las figuras que guarda cache.CacheFiguras)
+    return _actual(valor)
+
+
+def usar_serializador(nombre):
+    # Cambia el serializador de Dash para todo el proceso, no sólo para una app
+    global _actual
+    if nombre not in SERIALIZADORES:
+        raise ValueError(f"Serializador desconocido o no instalado: {nombre} (disponibles: {', '.join(SERIALIZADORES)})")
+    _actual = SERIALIZADORES[nombre]
+    for modulo in _MODULOS:
+        modulo.to_json = _actual
@@ -0,0 +1,169 @@
+import hashlib
+import json
+import threading
+
+
+class Instantanea:
+    # Una versión completa e inmutable de los datos: cubo, taxonomía, geometría y las listas
+    # de años y municipios. La tabla leída no se guarda: todo se consulta en el cubo, y así no
+    # queda en memoria en cada instantánea. Nunca se modifica; una recarga o una novedad arma otra
+    # aparte (el cubo y la taxonomía nuevos son copias) y DatosTablero la publica con una sola
+    # asignación. Un callback que toma la instantánea al empezar ve siempre los mismos datos
+    # de principio a fin, aunque a la mitad se publique otra.
+    __slots__ = ('version', 'geometrias', 'geojson_data', 'geojson_data_otra',
+                 'mapa_base', 'cubo', 'taxonomia', 'municipios', 'years')
+
+    def __init__(self, **atributos):
+        for nombre in self.__slots__:
+            object.__setattr__(self, nombre, atributos[nombre])
+
+    def __setattr__(self, nombre, valor):
+        raise AttributeError(f"La instantánea de los datos no se modifica (se intentó cambiar {nombre})")
+
+    def reemplazar(self, **cambios):
+        # Instantánea nueva con algunos atributos distintos
+        return Instantanea(**{**{nombre: getattr(self, nombre) for nombre in self.__slots__}, **cambios})
+
+
+class DatosTablero:
+    # Acceso a los datos del tablero a través de la instantánea actual (instantanea()).
+    # Se cargan la primera vez que se piden, no al importar ni al crear la app, y una sola vez
+    # aunque lleguen varias peticiones a la vez. Las recargas y las novedades se arman aparte
+    # mientras las peticiones siguen leyendo la instantánea anterior, y se publican al final
+    # con una asignación (doble búfer): ninguna petición ve datos a medio cargar.
+    # datos.cubo, datos.years, ... son atajos a la instantánea actual; un callback que lee
+    # varios atributos debe tomar la instantánea una vez y leerlos de ella.
+
+    def __init__(self, config):
+        self.config = config
+        # Sólo para quienes escriben (carga, recargas, novedades), de a uno; leer no lo toma
+        self._candado = threading.Lock()
+        self._actual = None
+        # Funciones que reciben cada instantánea que publican recargar e integrar
+        self._suscriptores = []
+
+    def __getattr__(self, nombre):
+        # Sólo se llega aquí con los atributos que no son de DatosTablero
+        if nombre.startswith('_'):
+            raise AttributeError(nombre)
+        return getattr(self.instantanea(), nombre)
+
+    def instantanea(self):
+        actual = self._actual
+        if actual is None:
+            actual = self.cargar()
+        return actual
+
+    def cargar(self):
+        with self._candado:
+            if self._actual is None:
+                self._actual = self._construir()
+            return self._actual
+
+    def al_publicar(self, funcion):
+        # `funcion(instantanea)` se llama en el mismo hilo después de cada recarga o novedad,
+        # ya publicada la instantánea y sin el candado (p. ej. calentamiento.py)
+        self._suscriptores.append(funcion)
+
+    def _avisar(self, instantanea):
+        for funcion in self._suscriptores:
+            funcion(instantanea)
+        return instantanea
+
+    def recargar(self, novedades=()):
+        # Vuelve a leer el paquete o el CSV y les aplica `novedades` (ver integrar) antes de publicar
+        with self._candado:
+            instantanea = self._integrada(self._construir(), novedades)
+            self._actual = instantanea
+        return self._avisar(instantanea)
+
+    def integrar(self, novedades):
+        # Integra archivos de novedades (ingesta.py) sin volver a leer los datos: `novedades` es
+        # una lista de (tabla, meses que trae, huella del contenido) y se publican todas juntas
+        self.cargar()
+        with self._candado:
+            instantanea = self._integrada(self._actual, novedades)
+            self._actual = instantanea
+        return self._avisar(instantanea)
+
+    @staticmethod
+    def _integrada(instantanea, novedades):
+        # El cubo, la taxonomía y las listas de años y municipios se actualizan sólo con las filas
+        # de las novedades, todas de una vez (el cubo se copia una sola vez). La versión nueva
+        # depende de la anterior y del contenido de cada archivo (`huella`), así que los workers
+        # que integran los mismos archivos en el mismo orden coinciden, y la caché deja de servir
+        # las figuras de la anterior.
+        from cubo import DIMENSIONES
+
+        if not novedades:
+            return instantanea
+        version = instantanea.version
+        for _, _, huella in novedades:
+            version = hashlib.sha1(f'{version}:{huella}'.encode()).hexdigest()[:12]
+        cambios = {
+            'cubo': instantanea.cubo.integrar([(df, meses) for df, meses, _ in novedades]),
+            'taxonomia': instantanea.taxonomia.ampliada(combinacion for df, _, _ in novedades for combinacion in
+                                                        df[list(DIMENSIONES.values())].drop_duplicates().itertuples(index=False, name=None)),
+            'version': version,
+        }
+        years = list(dict.fromkeys(year for df, _, _ in novedades for year in df['Año'].unique() if year not in instantanea.years))
+        if years:
+            cambios['years'] = sorted([*instantanea.years, *years])
+        conocidos = set(instantanea.municipios)
+        municipios = list(dict.fromkeys(municipio for df, _, _ in novedades
+                                        for municipio in df['Municipio'].unique() if municipio not in conocidos))
+        if municipios:
+            cambios['municipios'] = [*instantanea.municipios, *municipios]
+        return instantanea.reemplazar(**cambios)
+
+    def _construir(self):
+        # Se importan aquí para que importar la app no importe pandas ni lea nada
+        from cubo import CuboDelitos
+        from datos import leer_csv, version_archivo
+        from figuras import figura_mapa_base
+        from geometria import ENTRADA, leer_nivel, url_nivel
+        from paquete import abrir_paquete
+        from taxonomia import Taxonomia
+
+        config = self.config
+        niveles = (config['nivel_mapa'], config['nivel_mapa_otra'])
+
+        # Geometría simplificada (python geometria.py): el mapa principal usa el nivel medio
+        # y el mapa de comparación, que es más pequeño, el nivel bajo.
+        # Se sirve una sola vez en una URL versionada y las figuras sólo la referencian,
+        # así las respuestas de los callbacks llevan únicamente los valores por municipio.
+        geometrias = {}
+        urls_geometria = {}
+
+        # Si existe el paquete compilado (python paquete.py) se abre con mmap en lugar de leer el CSV
+        paquete = abrir_paquete(config['paquete'], fuentes=(config['csv'], ENTRADA))
+        if paquete is not None:
+            df = paquete.tabla()
+            version = paquete.version
+            geometrias = paquete.geometrias()
+            urls_geometria = {nivel: paquete.url_geometria(nivel) for nivel in niveles}
+        else:
+            df = leer_csv(config['csv'])
+            version = version_archivo(config['csv'])
+            for nivel in niveles:
+                contenido = leer_nivel(nivel)
+                urls_geometria[nivel] = url_nivel(nivel, contenido)
+                geometrias[urls_geometria[nivel]] = contenido
+
+        geojson_data = urls_geometria[config['nivel_mapa']]
+        return Instantanea(
+            version=version,
+            geometrias=geometrias,
+            geojson_data=geojson_data,
+            geojson_data_otra=urls_geometria[config['nivel_mapa_otra']],
+            # Mapa de todos los municipios en gris que se muestra sin selección; no depende de los
+            # conteos, así que lo comparten las instantáneas que integran novedades
+            mapa_base=figura_mapa_base(geojson_data, [feature['properties']['NOM_MUN'] for feature in json.loads(geometrias[geojson_data])['features']],
+                                       "Mapa de municipios de Campeche"),
+            # Cubo de conteos precalculado para que los callbacks no filtren el DataFrame
+            cubo=CuboDelitos(df),
+            # Índice de la taxonomía de delitos para las listas en cascada
+            taxonomia=Taxonomia(df),
+            municipios=df['Municipio'].unique(),
+            years=sorted(df['Año'].unique()),
+        )
@@ -0,0 +1,53 @@
+from cubo import DIMENSIONES
+
+
+class Taxonomia:
+    # Índice jerárquico bien jurídico → tipo → subtipo → modalidades.
+    # Se arma con un solo groupby sobre las combinaciones existentes; las listas
+    # conservan el orden de aparición en el CSV, como los antiguos .unique().
+
+    def __init__(self, df):
+        combinaciones = df.groupby(list(DIMENSIONES.values()), sort=False, observed=True).size().index
+        self.arbol = {}
+        self._subtipos_por_tipo = {}
+        self._tipos = {}
+        for combinacion in combinaciones:
+            self._agregar(*combinacion)
+
+    def _agregar(self, bien, tipo, subtipo, modalidad):
+        modalidades = self.arbol.setdefault(bien, {}).setdefault(tipo, {}).setdefault(subtipo, [])
+        if modalidad not in modalidades:
+            modalidades.append(modalidad)
+        subtipos = self._subtipos_por_tipo.setdefault(tipo, [])
+        if subtipo not in subtipos:
+            subtipos.append(subtipo)
+        self._tipos.setdefault(tipo, None)
+
+    def ampliada(self, combinaciones):
+        # Copia con las combinaciones (bien, tipo, subtipo, modalidad) que falten agregadas al
+        # final; esta no cambia, así que los callbacks que la estén usando no ven listas a medias
+        taxonomia = object.__new__(Taxonomia)
+        taxonomia.arbol = {bien: {tipo: {subtipo: list(modalidades) for subtipo, modalidades in por_subtipo.items()}
+                                  for tipo, por_subtipo in por_tipo.items()}
+                           for bien, por_tipo in self.arbol.items()}
+        taxonomia._subtipos_por_tipo = {tipo: list(subtipos) for tipo, subtipos in self._subtipos_por_tipo.items()}
+        taxonomia._tipos = dict(self._tipos)
+        for combinacion in combinaciones:
+            taxonomia._agregar(*combinacion)
+        return taxonomia
+
+    def bienes(self):
+        return list(self.arbol)
+
+    def tipos(self):
+        return list(self._tipos)
+
+    def delitos(self, bien):
+        return list(self.arbol.get(bien, {}))
+
+    def subdelitos(self, tipo):
+        # Subtipos de un tipo de delito sin importar el bien jurídico
+        return self._subtipos_por_tipo.get(tipo, [])
+
+    def modalidades(self, bien, tipo, subtipo):
+        return self.arbol.get(bien, {}).get(tipo, {}).get(subtipo, [])
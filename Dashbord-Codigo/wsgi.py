@@ -0,0 +1,25 @@
+# Punto de entrada WSGI para producción:
+#   gunicorn -c gunicorn.conf.py wsgi:application
+# Con precargar, los datos, el cubo y la geometría se cargan al crear la app; con
+# preload_app eso ocurre una sola vez en el proceso maestro, antes de crear los workers.
+import os
+
+from app import create_app
+
+# DASHBOARD_METRICAS=1 activa la ruta /metrics, DASHBOARD_SERVER_TIMING=1 el encabezado
+# Server-Timing y DASHBOARD_TRAZA=<archivo> la traza de los callbacks (DASHBOARD_TRAZA_MINIMO_MS
+# para guardar sólo los lentos)
+app = create_app({
+    'precargar': True,
+    'metricas': os.environ.get('DASHBOARD_METRICAS') == '1',
+    'server_timing': os.environ.get('DASHBOARD_SERVER_TIMING') == '1',
+    'traza': os.environ.get('DASHBOARD_TRAZA') or None,
+    'traza_minimo_ms': float(os.environ.get('DASHBOARD_TRAZA_MINIMO_MS', 0)),
+    # Directorio de novedades mensuales (ingesta.py)
+    'ingesta': os.environ.get('DASHBOARD_INGESTA') or None,
+    # Archivo SQLite de la caché de figuras compartida entre workers (cache.CacheCompartida)
+    'cache_compartida': os.environ.get('DASHBOARD_CACHE_COMPARTIDA') or None,
+    # Calcular las figuras más consultadas antes de crear los workers (calentamiento.py)
+    'calentamiento': os.environ.get('DASHBOARD_CALENTAMIENTO') == '1',
+})
+application = app.server